@@ -2,27 +2,35 @@
 """ Simple pagination
 """
 
-import csv
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from columnar_dataset import ColumnarDataset
+from dataset_index import DatasetIndex
+from dataset_registry import load_dataset, load_index
+from page_stream import Page, stream_pages
 
 
 class Server:
     """Server class to paginate a database of popular baby names.
     """
     DATA_FILE = "Popular_Baby_Names.csv"
+    # ColumnarDataset, or MmapDataset to parse pages lazily from the file
+    DATASET_BACKEND = ColumnarDataset
+    # Columns get_page can filter on, and sort by
+    FILTER_COLUMNS = ("Year of Birth", "Gender", "Ethnicity")
+    SORT_COLUMNS = ("Count", "Rank")
 
     def __init__(self):
         self.__dataset = None
+        self.__index = None
 
-    def dataset(self) -> List[List]:
+    def dataset(self) -> Sequence[List[str]]:
         """Cached dataset
         """
         if self.__dataset is None:
             try:
-                with open(self.DATA_FILE) as f:
-                    reader = csv.reader(f)
-                    dataset = [row for row in reader]
-                self.__dataset = dataset[1:]  # Skip the header
+                self.__dataset = load_dataset(self.DATA_FILE,
+                                              self.DATASET_BACKEND)
             except FileNotFoundError:
                 raise ValueError("The file does not exist.")
             except Exception as e:
@@ -32,12 +40,58 @@ class Server:
 
         return self.__dataset
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+    def index(self) -> DatasetIndex:
+        """Cached secondary indexes for filtered and sorted pages
+        """
+        if self.__index is None:
+            self.__index = load_index(self.dataset(), self.FILTER_COLUMNS,
+                                      self.SORT_COLUMNS)
+        return self.__index
+
+    def check_view(self, filters: Optional[Dict[str, str]],
+                   sort: Optional[str]) -> None:
+        """Assert that a filter and sort can be served from the indexes
+        """
+        assert filters is None or isinstance(filters, dict), \
+            "Filters must be a dictionary."
+        for name in filters or ():
+            assert name in self.FILTER_COLUMNS, \
+                "Cannot filter on column {}.".format(name)
+        assert sort is None or sort.lstrip("-") in self.SORT_COLUMNS, \
+            "Cannot sort by column {}.".format(sort)
+
+    def iter_pages(self, page_size: int = 10, page: int = 1,
+                   offset: Optional[int] = None,
+                   prefetch: bool = False) -> Iterator[Page]:
+        """Stream the pages of the data file without loading the dataset.
+
+        Parameters:
+        page_size (int): The number of records per page. Default is 10.
+        page (int): The page number to start from. Default is 1.
+        offset (int): The byte offset to resume from, the `next_offset` of
+        the last page read. `page` is then the number of that next page.
+        prefetch (bool): Read the next page on a background thread.
+
+        Returns:
+        Iterator[Page]: The pages, each with its number, its records and
+        the byte offsets where it and the next page start. Only one page
+        (two with prefetch) is held in memory at a time.
+        """
+        return stream_pages(self.DATA_FILE, page_size, page, offset,
+                            prefetch)
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 filters: Optional[Dict[str, str]] = None,
+                 sort: Optional[str] = None) -> List[List]:
         """Return the appropriate page of the dataset.
 
         Parameters:
         page (int): The page number to retrieve. Default is 1.
         page_size (int): The number of records per page. Default is 10.
+        filters (Dict[str, str]): Only return records whose FILTER_COLUMNS
+        hold these values, e.g. {"Gender": "FEMALE"}.
+        sort (str): Order records by one of SORT_COLUMNS, descending if
+        prefixed with "-", e.g. "-Count". In file order by default.
 
         Returns:
         List[List]: A list of lists representing the records for the
@@ -49,10 +103,15 @@ class Server:
             "Page number must be a positive integer."
         assert isinstance(page_size, int) and page_size > 0, \
             "Page size must be a positive integer."
+        self.check_view(filters, sort)
 
         dataset = self.dataset()
         start_index, end_index = index_range(page, page_size)
 
+        if filters or sort is not None:
+            ids = self.index().page(start_index, end_index, filters, sort)
+            return [dataset[i] for i in ids]
+
         if start_index >= len(dataset):
             return []  # Return an empty list if start index is out of range
 
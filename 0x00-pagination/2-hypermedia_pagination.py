@@ -3,9 +3,16 @@
 Hypermedia pagination
 """
 
-import csv
 import math
-from typing import Tuple, List, Dict, Any
+import os
+from typing import (Tuple, List, Dict, Any, Callable, Iterator, Optional,
+                    Sequence)
+
+from columnar_dataset import ColumnarDataset
+from cursor import decode_cursor, encode_cursor
+from dataset_index import DatasetIndex
+from dataset_registry import load_dataset, load_index
+from page_stream import Page, stream_pages
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -29,19 +36,26 @@ class Server:
     """Server class to paginate a database of popular baby names.
     """
     DATA_FILE = "Popular_Baby_Names.csv"
+    # ColumnarDataset, or MmapDataset to parse pages lazily from the file
+    DATASET_BACKEND = ColumnarDataset
+    # Columns get_page can filter on, and sort by
+    FILTER_COLUMNS = ("Year of Birth", "Gender", "Ethnicity")
+    SORT_COLUMNS = ("Count", "Rank")
+    # Signs keyset cursors; set a fixed secret to share them across
+    # processes and restarts
+    CURSOR_KEY = os.urandom(32)
 
     def __init__(self):
         self.__dataset = None
+        self.__index = None
 
-    def dataset(self) -> List[List]:
+    def dataset(self) -> Sequence[List[str]]:
         """Cached dataset
         """
         if self.__dataset is None:
             try:
-                with open(self.DATA_FILE) as f:
-                    reader = csv.reader(f)
-                    dataset = [row for row in reader]
-                self.__dataset = dataset[1:]  # Skip the header
+                self.__dataset = load_dataset(self.DATA_FILE,
+                                              self.DATASET_BACKEND)
             except FileNotFoundError:
                 raise ValueError("The file does not exist.")
             except Exception as e:
@@ -51,52 +65,207 @@ class Server:
 
         return self.__dataset
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+    def index(self) -> DatasetIndex:
+        """Cached secondary indexes for filtered and sorted pages
+        """
+        if self.__index is None:
+            self.__index = load_index(self.dataset(), self.FILTER_COLUMNS,
+                                      self.SORT_COLUMNS)
+        return self.__index
+
+    def check_page(self, page: int, page_size: int) -> None:
+        """Assert that a page number and size are valid
+        """
+        assert isinstance(
+            page, int) and page > 0, "Page number must be a \
+                positive integer."
+        assert isinstance(
+            page_size, int) and page_size > 0, "Page size must be \
+        a positive integer."
+
+    def check_view(self, filters: Optional[Dict[str, str]],
+                   sort: Optional[str],
+                   where: Optional[Callable] = None) -> None:
+        """Assert that a filter and sort can be served from the indexes
+        """
+        assert filters is None or isinstance(filters, dict), \
+            "Filters must be a dictionary."
+        for name in filters or ():
+            assert name in self.FILTER_COLUMNS, \
+                "Cannot filter on column {}.".format(name)
+        assert sort is None or sort.lstrip("-") in self.SORT_COLUMNS, \
+            "Cannot sort by column {}.".format(sort)
+        assert where is None or callable(where), \
+            "Where must be a predicate on records."
+
+    def iter_pages(self, page_size: int = 10, page: int = 1,
+                   offset: Optional[int] = None,
+                   prefetch: bool = False) -> Iterator[Page]:
+        """Stream the pages of the data file without loading the dataset.
+
+        Parameters:
+        page_size (int): The number of records per page. Default is 10.
+        page (int): The page number to start from. Default is 1.
+        offset (int): The byte offset to resume from, the `next_offset` of
+        the last page read. `page` is then the number of that next page.
+        prefetch (bool): Read the next page on a background thread.
+
+        Returns:
+        Iterator[Page]: The pages, each with its number, its records and
+        the byte offsets where it and the next page start. Only one page
+        (two with prefetch) is held in memory at a time.
+        """
+        return stream_pages(self.DATA_FILE, page_size, page, offset,
+                            prefetch)
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 filters: Optional[Dict[str, str]] = None,
+                 sort: Optional[str] = None,
+                 where: Optional[Callable[[List[str]], bool]] = None
+                 ) -> List[List]:
         """
         Find the correct indexes to paginate dataset.
 
         Parameters:
         page (int): The page number to retrieve. Default is 1.
         page_size (int): The number of records per page. Default is 10.
+        filters (Dict[str, str]): Only return records whose FILTER_COLUMNS
+        hold these values, e.g. {"Gender": "FEMALE"}.
+        sort (str): Order records by one of SORT_COLUMNS, descending if
+        prefixed with "-", e.g. "-Count". In file order by default.
+        where (Callable): Only return records for which this returns
+        True. Unlike filters it is not indexed: the view is scanned up to
+        the page.
 
         Returns:
         List[List]: A list of lists representing the records for the
         specified page. If the start index is out of range, an empty
         list is returned.
         """
-        assert isinstance(
-            page, int) and page > 0, "Page number must be a \
-                positive integer."
-        assert isinstance(
-            page_size, int) and page_size > 0, "Page size must be \
-        a positive integer."
+        self.check_page(page, page_size)
+        self.check_view(filters, sort, where)
 
         dataset = self.dataset()
         start_index, end_index = index_range(page, page_size)
 
+        if filters or sort is not None or where is not None:
+            ids = self.index().page(start_index, end_index, filters, sort,
+                                    where)
+            return [dataset[i] for i in ids]
+
         if start_index >= len(dataset):
             return []  # Return an empty list if start index is out of range
 
         return dataset[start_index:end_index]
 
-    def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+    def get_hyper(self, page: int = 1, page_size: int = 10,
+                  filters: Optional[Dict[str, str]] = None,
+                  sort: Optional[str] = None,
+                  where: Optional[Callable[[List[str]], bool]] = None
+                  ) -> Dict[str, Any]:
         """
         Return dataset as a dictionary with hypermedia pagination details.
 
         Parameters:
         page (int): The page number to retrieve. Default is 1.
         page_size (int): The number of records per page. Default is 10.
+        filters (Dict[str, str]): See get_page.
+        sort (str): See get_page.
+        where (Callable): See get_page. The view is then scanned one
+        record past the page, so next_page is exact, while total_pages is
+        estimated from a sample of the records (raised to at least the
+        next page when there is one), and exact once the last page is
+        reached.
 
         Returns:
         Dict[str, Any]: A dictionary containing pagination details
         and the data for the specified page.
         """
-        total_pages = math.ceil(len(self.dataset()) / page_size)
+        if where is None:
+            data = self.get_page(page, page_size, filters, sort)
+            if filters:
+                total = self.index().count(filters)
+            else:
+                total = len(self.dataset())
+            total_pages = math.ceil(total / page_size)
+            has_next = page < total_pages
+        else:
+            self.check_page(page, page_size)
+            self.check_view(filters, sort, where)
+            start_index, end_index = index_range(page, page_size)
+            ids = self.index().page(start_index, end_index + 1, filters,
+                                    sort, where)
+            dataset = self.dataset()
+            data = [dataset[i] for i in ids[:page_size]]
+            has_next = len(ids) > page_size
+            total = self.index().estimate(filters or {}, where)
+            total_pages = math.ceil(total / page_size)
+            if has_next:
+                total_pages = max(total_pages, page + 1)
+            elif data:
+                total_pages = page
+            else:
+                total_pages = min(total_pages, page - 1)
         return {
             "page_size": page_size,
             "page": page,
-            "data": self.get_page(page, page_size),
-            "next_page": page + 1 if page + 1 <= total_pages else None,
+            "data": data,
+            "next_page": page + 1 if has_next else None,
             "prev_page": page - 1 if page > 1 else None,
             "total_pages": total_pages
         }
+
+    def get_hyper_keyset(self, after: Optional[str] = None,
+                         page_size: int = 10,
+                         filters: Optional[Dict[str, str]] = None,
+                         sort: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return a page following a cursor, with hypermedia details.
+
+        Unlike get_hyper, which skips to an offset, this seeks to the
+        record after the last one of the previous page, so a page costs
+        the same however deep it is, and records added or removed before
+        it do not shift it.
+
+        Parameters:
+        after (str): The `next_after` token of the previous page, None for
+        the first page.
+        page_size (int): The number of records per page. Default is 10.
+        filters (Dict[str, str]): See get_page. Must be the same as for
+        the previous page.
+        sort (str): See get_page. Must be the same as for the previous
+        page.
+
+        Returns:
+        Dict[str, Any]: A dictionary containing the page size, the cursor,
+        the data, and the cursor of the next page (None on the last page).
+        """
+        assert isinstance(page_size, int) and page_size > 0, \
+            "Page size must be a positive integer."
+        self.check_view(filters, sort)
+        view = {"filters": filters or {}, "sort": sort}
+
+        key = None
+        if after is not None:
+            cursor = decode_cursor(self.CURSOR_KEY, after)
+            assert isinstance(cursor, dict) and "key" in cursor, \
+                "Invalid cursor."
+            assert cursor.get("view") == view, \
+                "Cursor belongs to another filter or sort."
+            key = tuple(cursor["key"])
+
+        index = self.index()
+        dataset = self.dataset()
+        ids = index.seek(filters, sort, key, page_size + 1)
+        next_after = None
+        if len(ids) > page_size:
+            ids = ids[:page_size]
+            order = sort.lstrip("-") if sort is not None else None
+            next_after = encode_cursor(self.CURSOR_KEY, {
+                "view": view, "key": list(index.key(order, ids[-1]))})
+        return {
+            "page_size": page_size,
+            "after": after,
+            "data": [dataset[i] for i in ids],
+            "next_after": next_after
+        }
@@ -3,28 +3,33 @@
 Deletion-resilient hypermedia pagination
 """
 
-import csv
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Sequence
+
+from columnar_dataset import ColumnarDataset
+from dataset_registry import load_dataset
+from live_index import LiveIndex
 
 
 class Server:
     """Server class to paginate a database of popular baby names.
     """
     DATA_FILE = "Popular_Baby_Names.csv"
+    # ColumnarDataset, or MmapDataset to parse pages lazily from the file
+    DATASET_BACKEND = ColumnarDataset
 
     def __init__(self):
         self.__dataset = None
         self.__indexed_dataset = None
+        self.__lock = threading.Lock()
 
-    def dataset(self) -> List[List]:
+    def dataset(self) -> Sequence[List[str]]:
         """Cached dataset
         """
         if self.__dataset is None:
             try:
-                with open(self.DATA_FILE) as f:
-                    reader = csv.reader(f)
-                    dataset = [row for row in reader]
-                self.__dataset = dataset[1:]  # Skip the header
+                self.__dataset = load_dataset(self.DATA_FILE,
+                                              self.DATASET_BACKEND)
             except FileNotFoundError:
                 raise ValueError("The file does not exist.")
             except Exception as e:
@@ -34,16 +39,49 @@ class Server:
 
         return self.__dataset
 
-    def indexed_dataset(self) -> Dict[int, List]:
+    def indexed_dataset(self) -> LiveIndex:
         """Dataset indexed by sorting position, starting at 0
         """
         if self.__indexed_dataset is None:
             dataset = self.dataset()
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
+            with self.__lock:
+                if self.__indexed_dataset is None:
+                    self.__indexed_dataset = LiveIndex(dataset)
         return self.__indexed_dataset
 
+    def delete(self, index: int) -> None:
+        """
+        Deletes the row at an index.
+
+        Raises KeyError if there is no live row at that index.
+        """
+        csv = self.indexed_dataset()
+        with self.__lock:
+            del csv[index]
+
+    def insert(self, row: List[str]) -> int:
+        """
+        Inserts a row after the last index and returns its index.
+
+        Indexes are never shifted, so a client paging with next_index
+        sees the row when it reaches the end.
+        """
+        assert isinstance(row, list), "Row must be a list."
+        csv = self.indexed_dataset()
+        with self.__lock:
+            return csv.append(list(row))
+
+    def update(self, index: int, row: List[str]) -> None:
+        """
+        Replaces the row at an index.
+
+        Raises KeyError if there is no live row at that index.
+        """
+        assert isinstance(row, list), "Row must be a list."
+        csv = self.indexed_dataset()
+        with self.__lock:
+            csv[index] = list(row)
+
     def get_hyper_index(self, index: int = None,
                         page_size: int = 10) -> Dict[str, Any]:
         """
@@ -63,19 +101,18 @@ class Server:
         assert index >= 0, "Index must be a non-negative integer."
 
         csv = self.indexed_dataset()
-        csv_size = len(csv)
-        assert index < csv_size, "Index out of range."
-
-        data = []
-        next_index = index
-
-        for _ in range(page_size):
-            while next_index < csv_size and next_index not in csv:
-                next_index += 1
-            if next_index >= csv_size:
-                break
-            data.append(csv[next_index])
-            next_index += 1
+        with self.__lock:
+            size = csv.size
+            assert index < size, "Index out of range."
+            positions = csv.next_live(index, page_size)
+            data = csv.rows(positions)
+
+        if len(positions) < page_size:
+            next_index = size
+        elif positions:
+            next_index = positions[-1] + 1
+        else:
+            next_index = index
 
         return {
             "index": index,
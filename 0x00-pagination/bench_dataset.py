@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the dataset representations.
+
+Loads the data file as the list of lists the servers used to hold, as a
+ColumnarDataset and as an MmapDataset, and prints the memory each one
+keeps allocated (measured with tracemalloc) along with its load time and
+the time to serve a page. It also checks that they return the same rows.
+Run it twice to see the MmapDataset open with its saved offsets.
+
+Usage:
+    ./bench_dataset.py [csv_file]
+"""
+
+import csv
+import sys
+import time
+import tracemalloc
+
+from columnar_dataset import ColumnarDataset
+from mmap_dataset import MmapDataset
+
+
+def load_lists(path):
+    """Load the rows the way the servers used to"""
+    with open(path) as f:
+        return [row for row in csv.reader(f)][1:]
+
+
+def load_columnar(path):
+    """Load the rows as a ColumnarDataset"""
+    return ColumnarDataset.from_csv(path)
+
+
+def load_mmap(path):
+    """Open the rows as an MmapDataset"""
+    return MmapDataset(path)
+
+
+def measure(load, path):
+    """Return (dataset, bytes retained, load seconds)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    dataset = load(path)
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dataset, retained, elapsed
+
+
+def page_time(dataset, page_size=100, pages=1000):
+    """Return the mean seconds needed to slice one page"""
+    last = max(len(dataset) - page_size, 1)
+    start = time.perf_counter()
+    for page in range(pages):
+        offset = page * page_size % last
+        dataset[offset:offset + page_size]
+    return (time.perf_counter() - start) / pages
+
+
+def main():
+    """Run the benchmark and print one line per representation"""
+    path = sys.argv[1] if len(sys.argv) > 1 else "Popular_Baby_Names.csv"
+    print("{:>14} {:>12} {:>10} {:>12}".format(
+        "representation", "memory KiB", "load ms", "page us"))
+    results = []
+    for name, load in (("list of lists", load_lists),
+                       ("columnar", load_columnar),
+                       ("mmap", load_mmap)):
+        dataset, retained, elapsed = measure(load, path)
+        results.append(dataset)
+        print("{:>14} {:>12.0f} {:>10.1f} {:>12.1f}".format(
+            name, retained / 1024, elapsed * 1000,
+            page_time(dataset) * 1e6))
+    lists = results[0]
+    for dataset in results[1:]:
+        assert lists == dataset[0:len(dataset)], "representations disagree"
+
+
+if __name__ == "__main__":
+    main()
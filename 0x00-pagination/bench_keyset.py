@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Deep-page benchmark for keyset pagination.
+
+Times fetching one page at increasing depths of a filtered and sorted
+view, by page number with get_hyper and by cursor with get_hyper_keyset
+(the cursors are collected beforehand by walking the view). Each figure
+is the best of several runs, in microseconds.
+
+Usage:
+    ./bench_keyset.py [page_size] [runs]
+"""
+
+import sys
+import time
+
+Server = __import__('2-hypermedia_pagination').Server
+
+FILTERS = {"Gender": "FEMALE"}
+SORT = "-Count"
+
+
+def best_of(fetch, runs):
+    """Return the best time of `runs` fetches, in seconds"""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fetch()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Walk the view once for its cursors, then time pages at each depth
+    """
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    server = Server()
+    cursors = [None]
+    while True:
+        res = server.get_hyper_keyset(cursors[-1], page_size, FILTERS, SORT)
+        if res["next_after"] is None:
+            break
+        cursors.append(res["next_after"])
+    print("{:>8} {:>12} {:>12}".format("page", "offset us", "keyset us"))
+    page = 1
+    while page <= len(cursors):
+        offset = best_of(lambda: server.get_hyper(page, page_size, FILTERS,
+                                                  SORT), runs)
+        keyset = best_of(lambda: server.get_hyper_keyset(
+            cursors[page - 1], page_size, FILTERS, SORT), runs)
+        print("{:>8} {:>12.1f} {:>12.1f}".format(page, offset * 1e6,
+                                                 keyset * 1e6))
+        page *= 4
+
+
+if __name__ == "__main__":
+    main()
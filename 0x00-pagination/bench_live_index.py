@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the deletion-resilient index.
+
+Compares the Dict[int, List] the deletion-resilient server used to keep
+(probing positions one by one past the deleted ones) with LiveIndex,
+after deleting 10%, 50% and 90% of the rows at random: memory held by
+the index itself, and the time to walk every page with get_hyper_index.
+
+Usage:
+    ./bench_live_index.py [csv_file] [page_size]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from columnar_dataset import ColumnarDataset
+from live_index import LiveIndex
+
+
+def dict_index(dataset):
+    """Build the index the way the server used to"""
+    return {i: dataset[i] for i in range(len(dataset))}
+
+
+def dict_page(index, size, position, page_size):
+    """Return the next page the way get_hyper_index used to"""
+    data = []
+    for _ in range(page_size):
+        while position < size and position not in index:
+            position += 1
+        if position >= size:
+            break
+        data.append(index[position])
+        position += 1
+    return data, position
+
+
+def live_page(index, size, position, page_size):
+    """Return the next page with LiveIndex"""
+    positions = index.next_live(position, page_size)
+    data = index.rows(positions)
+    return data, positions[-1] + 1 if positions else size
+
+
+def walk(page, index, size, page_size):
+    """Page through the whole index; return the seconds and rows seen"""
+    rows = 0
+    position = 0
+    start = time.perf_counter()
+    while position < size:
+        data, position = page(index, size, position, page_size)
+        rows += len(data)
+    return time.perf_counter() - start, rows
+
+
+def build(make, dataset, doomed):
+    """Build an index and delete rows from it; return it and its memory
+    """
+    tracemalloc.start()
+    index = make(dataset)
+    for i in doomed:
+        del index[i]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return index, memory
+
+
+def main():
+    """Delete a share of the rows, then measure both indexes"""
+    path = sys.argv[1] if len(sys.argv) > 1 else "Popular_Baby_Names.csv"
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    dataset = ColumnarDataset.from_csv(path, snapshot=False)
+    size = len(dataset)
+    rng = random.Random(0)
+    print("{:>8} {:>10} {:>12} {:>10}".format("deleted", "index", "memory",
+                                              "walk ms"))
+    for share in (0.1, 0.5, 0.9):
+        doomed = rng.sample(range(size), int(size * share))
+        seen = set()
+        for name, make, page in (("dict", dict_index, dict_page),
+                                 ("live", LiveIndex, live_page)):
+            index, memory = build(make, dataset, doomed)
+            elapsed, rows = walk(page, index, size, page_size)
+            seen.add(rows)
+            print("{:>7.0%} {:>10} {:>12,} {:>10.2f}".format(
+                share, name, memory, elapsed * 1000))
+        assert len(seen) == 1, "indexes disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the pagination dataset.
+
+Times how long a fresh process would take to get its dataset ready:
+parsing the CSV into a list of lists (as the servers used to), parsing it
+into a ColumnarDataset, and loading the ColumnarDataset's binary snapshot.
+Each figure is the best of several runs.
+
+Usage:
+    ./bench_startup.py [csv_file] [runs]
+"""
+
+import csv
+import os
+import sys
+import time
+
+from columnar_dataset import SNAPSHOT_SUFFIX, ColumnarDataset
+
+
+def parse_lists(path):
+    """Parse the rows the way the servers used to"""
+    with open(path) as f:
+        return [row for row in csv.reader(f)][1:]
+
+
+def parse_columnar(path):
+    """Parse the CSV into a ColumnarDataset, ignoring any snapshot"""
+    return ColumnarDataset.from_csv(path, snapshot=False)
+
+
+def load_snapshot(path):
+    """Load the ColumnarDataset from its snapshot"""
+    dataset = ColumnarDataset.load_snapshot(path + SNAPSHOT_SUFFIX,
+                                            os.stat(path))
+    assert dataset is not None, "no up to date snapshot"
+    return dataset
+
+
+def best_of(load, path, runs):
+    """Return the best time of `runs` loads, in seconds"""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        load(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Write the snapshot, then time each way of loading the dataset"""
+    path = sys.argv[1] if len(sys.argv) > 1 else "Popular_Baby_Names.csv"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    ColumnarDataset.from_csv(path, snapshot=False).save_snapshot(
+        path + SNAPSHOT_SUFFIX, os.stat(path))
+    print("{:>22} {:>10}".format("startup", "ms"))
+    for name, load in (("csv -> list of lists", parse_lists),
+                       ("csv -> columnar", parse_columnar),
+                       ("snapshot -> columnar", load_snapshot)):
+        elapsed = best_of(load, path, runs)
+        print("{:>22} {:>10.2f}".format(name, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Columnar dataset module
+
+This module provides ColumnarDataset, a compact read-only in-memory table
+used by the pagination servers instead of a list of lists.
+
+Each column is stored on its own: columns holding only integers live in
+a typed array, other columns are dictionary-encoded (each distinct string
+is stored once and rows hold a small integer code). Rows are only built,
+as lists of strings like csv.reader returns them, for the slice asked for.
+
+Once parsed, a dataset is saved as a binary snapshot next to its CSV file
+(`<file>.snapshot`): a header, JSON metadata and the raw column arrays,
+with a CRC32 checksum. Later loads read the snapshot instead of parsing
+the CSV, as long as the CSV's size and modification time are unchanged.
+"""
+
+import csv
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterable, List, Optional, Union
+
+UNSIGNED_TYPECODES = "BHILQ"
+SIGNED_TYPECODES = "bhilq"
+
+SNAPSHOT_SUFFIX = ".snapshot"
+SNAPSHOT_MAGIC = b"COLSNAP1"
+# magic, CSV size, CSV mtime in ns, metadata length, payload CRC32
+SNAPSHOT_HEADER = struct.Struct("<8sQQQI")
+
+
+def smallest_typecode(low: int, high: int) -> str:
+    """Return the smallest array typecode holding every int in [low, high]
+    """
+    typecodes = UNSIGNED_TYPECODES if low >= 0 else SIGNED_TYPECODES
+    for typecode in typecodes:
+        bits = array(typecode).itemsize * 8
+        if low >= 0 and high < 1 << bits:
+            return typecode
+        if low < 0 and -(1 << (bits - 1)) <= low and high < 1 << (bits - 1):
+            return typecode
+    raise OverflowError("Integer column out of range.")
+
+
+class IntColumn:
+    """A column of integers stored in a typed array
+    """
+
+    def __init__(self, values: Iterable[int]):
+        values = list(values)
+        typecode = smallest_typecode(min(values, default=0),
+                                     max(values, default=0))
+        self.values = array(typecode, values)
+
+    @classmethod
+    def from_array(cls, values: array) -> "IntColumn":
+        """Wrap an already typed array"""
+        column = cls.__new__(cls)
+        column.values = values
+        return column
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: Union[int, slice]):
+        """Return the cell(s) as strings, as read from the CSV"""
+        if isinstance(index, slice):
+            return [str(value) for value in self.values[index]]
+        return str(self.values[index])
+
+
+class DictColumn:
+    """A column of strings stored as codes into a table of distinct values
+    """
+
+    def __init__(self, cells: Iterable[str]):
+        self.values = []
+        codes = {}
+        indexes = []
+        for cell in cells:
+            code = codes.get(cell)
+            if code is None:
+                code = codes[cell] = len(self.values)
+                self.values.append(cell)
+            indexes.append(code)
+        self.codes = array(smallest_typecode(0, len(self.values)), indexes)
+
+    @classmethod
+    def from_codes(cls, values: List[str], codes: array) -> "DictColumn":
+        """Wrap an already built table of values and array of codes"""
+        column = cls.__new__(cls)
+        column.values = values
+        column.codes = codes
+        return column
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: Union[int, slice]):
+        """Return the cell(s)"""
+        if isinstance(index, slice):
+            values = self.values
+            return [values[code] for code in self.codes[index]]
+        return self.values[self.codes[index]]
+
+
+def make_column(cells: List[str]) -> Union[IntColumn, DictColumn]:
+    """Return an IntColumn if every cell round-trips as an int, else a
+    DictColumn
+    """
+    try:
+        values = [int(cell) for cell in cells]
+    except ValueError:
+        return DictColumn(cells)
+    if any(str(value) != cell for value, cell in zip(values, cells)):
+        return DictColumn(cells)
+    return IntColumn(values)
+
+
+class ColumnarDataset:
+    """Read-only table of rows stored column by column.
+
+    Supports len(), indexing and slicing like the List[List] it replaces:
+    `dataset[i]` is one row, `dataset[start:end]` a list of rows.
+    """
+
+    def __init__(self, header: List[str], columns: List):
+        self.header = header
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, header: List[str],
+                  rows: Iterable[List[str]]) -> "ColumnarDataset":
+        """Build a dataset from rows of strings"""
+        cells = [[] for _ in header]
+        for row in rows:
+            for column, cell in zip(cells, row):
+                column.append(cell)
+        return cls(header, [make_column(column) for column in cells])
+
+    @classmethod
+    def from_csv(cls, path: str, snapshot: bool = True) -> "ColumnarDataset":
+        """Load a CSV file whose first line is the header
+
+        With `snapshot`, load its snapshot if it is up to date, else parse
+        the CSV and (try to) write the snapshot for next time.
+        """
+        stat = os.stat(path)
+        snapshot_path = path + SNAPSHOT_SUFFIX
+        if snapshot:
+            dataset = cls.load_snapshot(snapshot_path, stat)
+            if dataset is not None:
+                return dataset
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            dataset = cls.from_rows(header, reader)
+        if snapshot:
+            dataset.save_snapshot(snapshot_path, stat)
+        return dataset
+
+    def save_snapshot(self, path: str, stat: os.stat_result) -> bool:
+        """Write the dataset to a snapshot of the CSV described by `stat`
+
+        The file is written under a temporary name and renamed, so readers
+        never see a partial snapshot. Returns False if it cannot be written.
+        """
+        columns = []
+        arrays = []
+        for column in self.columns:
+            if isinstance(column, IntColumn):
+                columns.append({"kind": "int",
+                                "typecode": column.values.typecode})
+                arrays.append(column.values)
+            else:
+                columns.append({"kind": "dict",
+                                "typecode": column.codes.typecode,
+                                "values": column.values})
+                arrays.append(column.codes)
+        metadata = json.dumps({
+            "header": self.header,
+            "rows": len(self),
+            "byteorder": sys.byteorder,
+            "columns": columns,
+        }).encode()
+        payload = [metadata] + [values.tobytes() for values in arrays]
+        crc = 0
+        for chunk in payload:
+            crc = zlib.crc32(chunk, crc)
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, stat.st_size,
+                                      stat.st_mtime_ns, len(metadata), crc)
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp, "wb") as f:
+                f.write(header)
+                for chunk in payload:
+                    f.write(chunk)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+        return True
+
+    @classmethod
+    def load_snapshot(cls, path: str,
+                      stat: os.stat_result) -> Optional["ColumnarDataset"]:
+        """Load a snapshot of the CSV described by `stat`
+
+        Returns None if there is no snapshot, or if it is corrupt or was
+        taken from another version of the CSV.
+        """
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < SNAPSHOT_HEADER.size:
+            return None
+        magic, size, mtime_ns, metadata_len, crc = \
+            SNAPSHOT_HEADER.unpack_from(data)
+        if (magic, size, mtime_ns) != (SNAPSHOT_MAGIC, stat.st_size,
+                                       stat.st_mtime_ns):
+            return None
+        payload = memoryview(data)[SNAPSHOT_HEADER.size:]
+        if zlib.crc32(payload) != crc:
+            return None
+        try:
+            metadata = json.loads(bytes(payload[:metadata_len]))
+            offset = metadata_len
+            columns = []
+            for spec in metadata["columns"]:
+                values = array(spec["typecode"])
+                end = offset + values.itemsize * metadata["rows"]
+                values.frombytes(payload[offset:end])
+                offset = end
+                if metadata["byteorder"] != sys.byteorder:
+                    values.byteswap()
+                if spec["kind"] == "int":
+                    columns.append(IntColumn.from_array(values))
+                else:
+                    columns.append(DictColumn.from_codes(spec["values"],
+                                                         values))
+        except (ValueError, KeyError, TypeError):
+            return None
+        if offset != len(payload):
+            return None
+        return cls(metadata["header"], columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, index: Union[int, slice]) -> List:
+        """Return row `index`, or the list of rows in a slice"""
+        if isinstance(index, slice):
+            return [list(row) for row in
+                    zip(*(column[index] for column in self.columns))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Row index out of range.")
+        return [column[index] for column in self.columns]
+
+    def __iter__(self):
+        """Iterate over the rows"""
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Cursor module
+
+This module encodes the `after` tokens of keyset pagination: a JSON
+payload and its HMAC-SHA256, both base64url-encoded. Clients treat them
+as opaque strings and cannot forge or alter one without the key.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any, Optional
+
+SIGNATURE_SIZE = 16
+
+
+def b64encode(data: bytes) -> str:
+    """Encode bytes as unpadded base64url"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def b64decode(text: str) -> bytes:
+    """Decode unpadded base64url"""
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def sign(key: bytes, data: bytes) -> bytes:
+    """Return the signature of `data`"""
+    return hmac.new(key, data, hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+
+def encode_cursor(key: bytes, payload: Any) -> str:
+    """Return the signed token of a JSON-serializable payload"""
+    data = json.dumps(payload, separators=(",", ":"),
+                      sort_keys=True).encode()
+    return "{}.{}".format(b64encode(data), b64encode(sign(key, data)))
+
+
+def decode_cursor(key: bytes, token: str) -> Optional[Any]:
+    """Return the payload of a token, or None if it is malformed or was
+    not signed with `key`
+    """
+    try:
+        data, signature = (b64decode(part) for part in token.split("."))
+    except (AttributeError, ValueError):
+        return None
+    if not hmac.compare_digest(signature, sign(key, data)):
+        return None
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
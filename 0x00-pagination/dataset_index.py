@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Dataset index module
+
+This module provides DatasetIndex, the secondary indexes behind filtered
+and sorted pagination, built once when a dataset is loaded:
+
+- for each sort column, the permutation of row ids in ascending order of
+  that column (numerically if every cell is an integer);
+- for each filter column, the ids of the rows holding each value, in file
+  order and in the order of each sort column.
+
+A page filtered on one column, sorted or not, is then a slice of one of
+these arrays. Filters on several columns start from the shortest of their
+lists and check the other columns' values; the matching ids are kept in a
+small LRU cache, so the next pages of the same view are slices too.
+
+The number of rows matching each combination of filter column values is
+counted at the same time, so the size of any filtered view is one lookup.
+Ad-hoc predicates on rows (`where`) cannot be indexed: their pages are
+found by scanning, and their counts estimated from a fixed-size sample of
+the rows matching the indexed filters.
+
+Every row of a view also has a key, its sort value and id, increasing
+along the view: `seek` finds a page by binary search for the key of the
+row before it, for keyset pagination.
+"""
+
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from itertools import combinations, islice
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from columnar_dataset import smallest_typecode
+
+
+def sort_values(cells: List[str]) -> Sequence:
+    """Return the values a column's cells sort by: as ints if they all are
+    """
+    try:
+        values = [int(cell) for cell in cells]
+    except ValueError:
+        return cells
+    return array(smallest_typecode(min(values, default=0),
+                                   max(values, default=0)), values)
+
+
+class DatasetIndex:
+    """Secondary indexes over a dataset whose header names its columns.
+    """
+    CACHE_SIZE = 64
+    SAMPLE_SIZE = 1024
+
+    def __init__(self, header: List[str], dataset: Sequence[List[str]],
+                 filter_columns: Sequence[str] = (),
+                 sort_columns: Sequence[str] = ()):
+        self.dataset = dataset
+        self.size = len(dataset)
+        typecode = smallest_typecode(0, self.size)
+        rows = dataset[0:self.size]
+        cells = {name: [row[header.index(name)] for row in rows]
+                 for name in set(filter_columns) | set(sort_columns)}
+        del rows
+
+        self.orders: Dict[Optional[str], Sequence[int]] = {
+            None: range(self.size)}
+        self.sort_values: Dict[str, Sequence] = {}
+        for name in sort_columns:
+            values = self.sort_values[name] = sort_values(cells[name])
+            self.orders[name] = array(typecode, sorted(
+                range(self.size), key=values.__getitem__))
+
+        self.values: Dict[str, Dict[str, int]] = {}
+        self.codes: Dict[str, array] = {}
+        self.postings: Dict[Tuple, array] = {}
+        for name in filter_columns:
+            values = self.values[name] = {}
+            for cell in cells[name]:
+                values.setdefault(cell, len(values))
+            codes = self.codes[name] = array(
+                smallest_typecode(0, len(values)),
+                (values[cell] for cell in cells[name]))
+            for order, ids in self.orders.items():
+                postings = [array(typecode) for _ in values]
+                for i in ids:
+                    postings[codes[i]].append(i)
+                for value, code in values.items():
+                    self.postings[name, value, order] = postings[code]
+
+        # Row counts of every combination of values of 2+ filter columns
+        self.counts: Dict[Tuple[str, ...], Counter] = {}
+        for n in range(2, len(filter_columns) + 1):
+            for names in combinations(sorted(filter_columns), n):
+                self.counts[names] = Counter(
+                    zip(*(self.codes[name] for name in names)))
+
+        self.cache: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def ids(self, filters: Dict[str, str],
+            order: Optional[str] = None) -> Sequence[int]:
+        """Return the ids of the rows matching every filter, ascending in
+        the `order` column (in file order if None)
+        """
+        if not filters:
+            return self.orders[order]
+        lists = [self.postings.get((name, value, order), array("B"))
+                 for name, value in filters.items()]
+        if len(filters) == 1:
+            return lists[0]
+        driving = min(lists, key=len)
+        checks = [(self.codes[name], self.values[name].get(value))
+                  for name, value in filters.items()]
+        return self.cached(
+            (frozenset(filters.items()), order),
+            lambda: array(driving.typecode, (
+                i for i in driving
+                if all(codes[i] == code for codes, code in checks))))
+
+    def cached(self, key, compute: Callable):
+        """Return the cached value of `key`, computing it on a miss"""
+        with self.lock:
+            value = self.cache.get(key)
+            if value is not None:
+                self.cache.move_to_end(key)
+                return value
+        value = compute()
+        with self.lock:
+            self.cache[key] = value
+            if len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return value
+
+    def count(self, filters: Dict[str, str]) -> int:
+        """Return the number of rows matching every filter, in O(1)"""
+        if not filters:
+            return self.size
+        if len(filters) == 1:
+            (name, value), = filters.items()
+            return len(self.postings.get((name, value, None), ()))
+        names = tuple(sorted(filters))
+        codes = tuple(self.values[name].get(filters[name])
+                      for name in names)
+        return self.counts[names][codes]
+
+    def estimate(self, filters: Dict[str, str],
+                 where: Callable[[List[str]], bool]) -> int:
+        """Estimate the number of rows matching every filter and `where`
+
+        `where` is tried on at most SAMPLE_SIZE rows evenly spread over
+        those matching the filters; the count is exact if there are no
+        more.
+        """
+        def compute():
+            ids = self.ids(filters)
+            step = max(len(ids) // self.SAMPLE_SIZE, 1)
+            sample = ids[::step]
+            if not sample:
+                return 0
+            hits = sum(1 for i in sample if where(self.dataset[i]))
+            return round(len(ids) * hits / len(sample))
+        return self.cached(("where", frozenset(filters.items()), where),
+                           compute)
+
+    def page(self, start: int, end: int, filters: Dict[str, str],
+             sort: Optional[str] = None,
+             where: Optional[Callable[[List[str]], bool]] = None
+             ) -> List[int]:
+        """Return the ids of rows [start, end) of a filtered and sorted view
+
+        `sort` is a sort column, prefixed with "-" for descending order.
+        Rows must also satisfy `where`, if given, which is found by
+        scanning the view from its start.
+        """
+        descending = sort is not None and sort.startswith("-")
+        ids = self.ids(filters, sort.lstrip("-") if descending else sort)
+        if where is not None:
+            order = reversed(ids) if descending else ids
+            dataset = self.dataset
+            return list(islice((i for i in order if where(dataset[i])),
+                               start, end))
+        if not descending:
+            return list(ids[start:end])
+        count = len(ids)
+        return list(ids[max(count - end, 0):max(count - start, 0)])[::-1]
+
+    def key(self, order: Optional[str], i: int) -> Tuple:
+        """Return the key of row `i` in the `order` view: its sort value,
+        then its id to break ties
+        """
+        if order is None:
+            return (i,)
+        return (self.sort_values[order][i], i)
+
+    def seek(self, filters: Dict[str, str], sort: Optional[str],
+             after: Optional[Tuple], count: int) -> List[int]:
+        """Return the ids of the first `count` rows of a filtered and
+        sorted view whose key comes after `after` (from the start if None)
+
+        The key is found by binary search, so this costs O(log n + count)
+        however deep into the view it is.
+        """
+        descending = sort is not None and sort.startswith("-")
+        order = sort.lstrip("-") if sort is not None else None
+        ids = self.ids(filters, order)
+        low, high = 0, len(ids)
+        if after is None:
+            low = high if descending else 0
+        else:
+            while low < high:
+                middle = (low + high) // 2
+                key = self.key(order, ids[middle])
+                if key < after or not descending and key == after:
+                    low = middle + 1
+                else:
+                    high = middle
+        if not descending:
+            return list(ids[low:low + count])
+        return list(ids[max(low - count, 0):low])[::-1]
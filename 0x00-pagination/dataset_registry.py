@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Dataset registry module
+
+This module keeps one parsed copy of each data file per process, shared
+by every Server that reads it. Entries are keyed by backend and absolute
+path and reloaded when the file's size or modification time changes.
+The secondary indexes of a loaded dataset are shared the same way, built
+the first time a view over given filter and sort columns asks for them
+and dropped with the dataset when it is reloaded.
+
+In a pre-fork deployment, call `preload` in the master process: the
+workers then inherit the parsed dataset and share its pages copy-on-write
+instead of each parsing and holding its own copy. A ColumnarDataset keeps
+its cells in a few large array buffers that reads never write to, and an
+MmapDataset is shared through the OS page cache in any case.
+"""
+
+import gc
+import os
+import threading
+from typing import Dict, Sequence, Tuple
+
+from columnar_dataset import ColumnarDataset
+from dataset_index import DatasetIndex
+
+_datasets: Dict[Tuple, Tuple[int, int, Sequence, Dict]] = {}
+_lock = threading.Lock()
+
+
+def load_dataset(path: str, backend=ColumnarDataset) -> Sequence:
+    """Return the shared dataset of a file, parsing it only if it is new
+    or has changed since it was last parsed.
+
+    Raises FileNotFoundError if the file does not exist.
+    """
+    stat = os.stat(path)
+    version = (stat.st_size, stat.st_mtime_ns)
+    key = (backend, os.path.abspath(path))
+    with _lock:
+        entry = _datasets.get(key)
+        if entry is not None and entry[:2] == version:
+            return entry[2]
+        dataset = backend.from_csv(path)
+        _datasets[key] = version + (dataset, {})
+        return dataset
+
+
+def load_index(dataset: Sequence, filter_columns: Sequence[str] = (),
+               sort_columns: Sequence[str] = ()) -> DatasetIndex:
+    """Return the shared index of a dataset over these columns, building
+    it only the first time it is asked for.
+
+    A dataset that was not loaded through the registry gets an index of
+    its own.
+    """
+    columns = (tuple(filter_columns), tuple(sort_columns))
+    with _lock:
+        for entry in _datasets.values():
+            if entry[2] is dataset:
+                indexes = entry[3]
+                break
+        else:
+            indexes = {}
+        index = indexes.get(columns)
+        if index is None:
+            index = indexes[columns] = DatasetIndex(dataset.header, dataset,
+                                                    *columns)
+        return index
+
+
+def preload(path: str, backend=ColumnarDataset) -> Sequence:
+    """Load a dataset before forking workers.
+
+    The garbage collector is told to leave every object allocated so far
+    alone, so that collections in the workers do not write to (and thus
+    copy) the pages holding the shared dataset.
+    """
+    dataset = load_dataset(path, backend)
+    gc.collect()
+    gc.freeze()
+    return dataset
+
+
+def clear() -> None:
+    """Forget every loaded dataset"""
+    with _lock:
+        _datasets.clear()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Live index module
+
+This module provides LiveIndex, the index behind deletion-resilient
+pagination. It maps each position of the dataset that has not been
+deleted to its row, like the Dict[int, List] it replaces, with a byte per
+position for the live flags and a Fenwick tree (binary indexed tree) of
+live counts instead of one dict entry per row.
+
+The Fenwick tree gives, in O(log n), the number of live positions before
+any position (rank) and the position of the k-th live one (select), so
+a page of the next k live rows costs O(k log n) however many rows were
+deleted before it, and a deletion costs O(log n).
+
+Positions are never reused or shifted: rows are inserted at new positions
+after the last one, and deleted or updated in place. The dataset itself,
+which may be shared with other Servers, is never written to; inserted and
+updated rows are kept alongside it.
+"""
+
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Sequence
+
+
+class LiveIndex(MutableMapping):
+    """Positions of a dataset that are still live, mapped to their rows.
+
+    `len()` is the number of live rows, `size` the number of positions.
+    Rows are removed with `del index[position]`, replaced with
+    `index[position] = row` and added with `append(row)`.
+    """
+    SCAN = 64
+
+    def __init__(self, dataset: Sequence[List[str]]):
+        self.dataset = dataset
+        self.base = self.size = len(dataset)
+        self.appended: List[List[str]] = []
+        self.updated: Dict[int, List[str]] = {}
+        self.live = bytearray(b"\x01") * self.size
+        self.count = self.size
+        tree = array("I", [1]) * (self.size + 1)
+        tree[0] = 0
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.top = 1
+        while self.top * 2 <= self.size:
+            self.top *= 2
+
+    def _add(self, position: int, delta: int) -> None:
+        """Add `delta` to the live count of a position"""
+        i = position + 1
+        tree = self.tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def rank(self, position: int) -> int:
+        """Return the number of live positions before `position`"""
+        total = 0
+        i = min(position, self.size)
+        tree = self.tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def select(self, k: int) -> int:
+        """Return the position of the k-th live row, counting from 0"""
+        if not 0 <= k < self.count:
+            raise IndexError("Live row out of range.")
+        position = 0
+        step = self.top
+        tree = self.tree
+        while step:
+            nxt = position + step
+            if nxt <= self.size and tree[nxt] <= k:
+                position = nxt
+                k -= tree[nxt]
+            step //= 2
+        return position
+
+    def next_live(self, position: int, k: int) -> List[int]:
+        """Return the positions of the next `k` live rows from `position`
+
+        Each row is first looked for in the next SCAN flags, and only past
+        a longer run of deleted rows found with select.
+        """
+        rank = self.rank(position)
+        last = min(rank + k, self.count)
+        live = self.live
+        positions = []
+        while rank < last:
+            position = live.find(1, position, position + self.SCAN)
+            if position == -1:
+                position = self.select(rank)
+            positions.append(position)
+            position += 1
+            rank += 1
+        return positions
+
+    def rows(self, positions: List[int]) -> List[List[str]]:
+        """Return the rows at ascending live positions, reading each run of
+        consecutive positions from the dataset as one slice
+        """
+        rows = []
+        i = 0
+        while i < len(positions) and positions[i] < self.base:
+            start = j = positions[i]
+            i += 1
+            while i < len(positions) and positions[i] == j + 1 \
+                    and positions[i] < self.base:
+                j += 1
+                i += 1
+            rows.extend(self.dataset[start:j + 1])
+        rows.extend(self.appended[position - self.base]
+                    for position in positions[i:])
+        if self.updated:
+            for i, position in enumerate(positions):
+                row = self.updated.get(position)
+                if row is not None:
+                    rows[i] = row
+        return rows
+
+    def __contains__(self, position) -> bool:
+        return isinstance(position, int) and 0 <= position < self.size \
+            and self.live[position] == 1
+
+    def __getitem__(self, position: int) -> List[str]:
+        if position not in self:
+            raise KeyError(position)
+        return self.rows([position])[0]
+
+    def __setitem__(self, position: int, row: List[str]) -> None:
+        """Replace the row at a live position"""
+        if position not in self:
+            raise KeyError(position)
+        if position < self.base:
+            self.updated[position] = row
+        else:
+            self.appended[position - self.base] = row
+
+    def __delitem__(self, position: int) -> None:
+        if position not in self:
+            raise KeyError(position)
+        self.live[position] = 0
+        self.count -= 1
+        self._add(position, -1)
+        if position < self.base:
+            self.updated.pop(position, None)
+        else:
+            self.appended[position - self.base] = None
+
+    def append(self, row: List[str]) -> int:
+        """Add a live row after the last position; return its position"""
+        position = self.size
+        i = position + 1
+        self.tree.append(1 + self.rank(position) - self.rank(i - (i & -i)))
+        self.live.append(1)
+        self.appended.append(row)
+        self.size += 1
+        self.count += 1
+        while self.top * 2 <= self.size:
+            self.top *= 2
+        return position
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the live positions"""
+        live = self.live
+        position = live.find(1)
+        while position != -1:
+            yield position
+            position = live.find(1, position + 1)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped dataset module
+
+This module provides MmapDataset, a read-only view of a CSV file that
+parses rows only when they are asked for.
+
+The file is memory-mapped, and an index of the byte offset at which each
+row starts is built once and saved next to it (`<file>.offsets`). Later
+opens map that sidecar too, so opening the dataset and reading one page
+costs the same whatever the size of the file, and every process reading
+the same file shares its pages through the OS page cache.
+"""
+
+import csv
+import io
+import mmap
+import os
+import struct
+from array import array
+from typing import List, Union
+
+SIDECAR_SUFFIX = ".offsets"
+SIDECAR_MAGIC = b"CSVOFF01"
+# magic, CSV size, CSV mtime in ns, number of offsets
+SIDECAR_HEADER = struct.Struct("<8sQQQ")
+
+
+def row_offsets(data) -> array:
+    """Return the offset of every row after the header, then the end
+
+    Newlines inside quoted fields do not end a row.
+    """
+    offsets = array("Q")
+    size = len(data)
+    start = 0
+    in_quotes = False
+    first = True
+    while start < size:
+        end = data.find(b"\n", start)
+        end = size if end == -1 else end + 1
+        if data.find(b'"', start, end) != -1 and \
+                data[start:end].count(b'"') % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            if not first:
+                offsets.append(row_start)
+            first = False
+            row_start = end
+        start = end
+    if not first and row_start < size:
+        offsets.append(row_start)
+    offsets.append(size)
+    return offsets
+
+
+class MmapDataset:
+    """Read-only dataset parsed lazily from a memory-mapped CSV file.
+
+    Supports len(), indexing and slicing like ColumnarDataset:
+    `dataset[i]` is one row, `dataset[start:end]` a list of rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sidecar = path + SIDECAR_SUFFIX
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.data = b""
+            if stat.st_size:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offsets = self._load_offsets(stat)
+        if self.offsets is None:
+            self.offsets = row_offsets(self.data)
+            self._save_offsets(stat)
+        self.header = next(csv.reader(io.StringIO(
+            self.data[:self.offsets[0]].decode())), [])
+
+    @classmethod
+    def from_csv(cls, path: str) -> "MmapDataset":
+        """Open a CSV file whose first line is the header"""
+        return cls(path)
+
+    def _load_offsets(self, stat):
+        """Map the sidecar index if it matches the CSV, else return None"""
+        try:
+            with open(self.sidecar, "rb") as f:
+                index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(index) < SIDECAR_HEADER.size:
+            return None
+        magic, size, mtime_ns, count = SIDECAR_HEADER.unpack_from(index)
+        if (magic, size, mtime_ns) != (SIDECAR_MAGIC, stat.st_size,
+                                       stat.st_mtime_ns) or \
+                len(index) != SIDECAR_HEADER.size + 8 * count:
+            return None
+        return memoryview(index)[SIDECAR_HEADER.size:].cast("Q")
+
+    def _save_offsets(self, stat):
+        """Write the sidecar index, if the directory is writable"""
+        header = SIDECAR_HEADER.pack(SIDECAR_MAGIC, stat.st_size,
+                                     stat.st_mtime_ns, len(self.offsets))
+        tmp = "{}.{}.tmp".format(self.sidecar, os.getpid())
+        try:
+            with open(tmp, "wb") as f:
+                f.write(header)
+                self.offsets.tofile(f)
+            os.replace(tmp, self.sidecar)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _parse(self, start: int, end: int) -> List[List[str]]:
+        """Parse rows [start, end) straight from the mapped file"""
+        text = self.data[self.offsets[start]:self.offsets[end]]
+        return list(csv.reader(io.StringIO(text.decode())))
+
+    def __getitem__(self, index: Union[int, slice]) -> List:
+        """Return row `index`, or the list of rows in a slice"""
+        if isinstance(index, slice):
+            start, end, step = index.indices(len(self))
+            if end <= start:
+                return []
+            rows = self._parse(start, end)
+            return rows if step == 1 else rows[::step]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Row index out of range.")
+        return self._parse(index, index + 1)[0]
+
+    def __iter__(self):
+        """Iterate over the rows"""
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Page stream module
+
+This module streams the pages of a CSV file in constant memory, for
+exports that walk the whole dataset: only the page being read is held,
+never the dataset.
+
+Each Page carries the byte offsets where it starts and where the next
+one starts, so a stream can be resumed from a page number (skimming the
+rows before it) or, without reading anything before it, from an offset.
+With `prefetch`, the next page is read on a background thread while the
+consumer works on the current one.
+"""
+
+import csv
+import queue
+import threading
+from typing import Iterator, List, NamedTuple, Optional
+
+
+class Page(NamedTuple):
+    """One page of rows and where it sits in the file"""
+    page: int
+    data: List[List[str]]
+    offset: int
+    next_offset: int
+
+
+def read_row(f) -> Optional[bytes]:
+    """Read the bytes of one CSV row, quoted newlines included"""
+    line = f.readline()
+    if not line:
+        return None
+    while line.count(b'"') % 2:
+        more = f.readline()
+        if not more:
+            break
+        line += more
+    return line
+
+
+def read_pages(path: str, page_size: int, page: int = 1,
+               offset: Optional[int] = None) -> Iterator[Page]:
+    """Yield the pages of `page_size` rows of a CSV file
+
+    Starts at page `page`, or, if `offset` is given, at that byte offset
+    (which is then taken to be the start of page `page`).
+    """
+    with open(path, "rb") as f:
+        if offset is None:
+            read_row(f)  # Skip the header
+            for _ in range((page - 1) * page_size):
+                if read_row(f) is None:
+                    return
+        else:
+            f.seek(offset)
+        while True:
+            start = f.tell()
+            lines = []
+            for _ in range(page_size):
+                line = read_row(f)
+                if line is None:
+                    break
+                lines.append(line.decode())
+            if not lines:
+                return
+            yield Page(page, list(csv.reader(lines)), start, f.tell())
+            page += 1
+
+
+def prefetched(pages: Iterator[Page]) -> Iterator[Page]:
+    """Yield from `pages`, reading one page ahead on a background thread"""
+    ahead = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    done = object()
+
+    def offer(item):
+        """Queue an item unless the consumer has stopped; return False if
+        it has
+        """
+        while not stop.is_set():
+            try:
+                ahead.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        """Read pages into the queue until exhausted or stopped"""
+        try:
+            for page in pages:
+                if not offer(page):
+                    return
+            offer(done)
+        except Exception as e:
+            offer(e)
+        finally:
+            pages.close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            page = ahead.get()
+            if page is done:
+                return
+            if isinstance(page, Exception):
+                raise page
+            yield page
+    finally:
+        stop.set()
+        thread.join()
+
+
+def stream_pages(path: str, page_size: int = 10, page: int = 1,
+                 offset: Optional[int] = None,
+                 prefetch: bool = False) -> Iterator[Page]:
+    """Yield the pages of a CSV file, see read_pages and prefetched"""
+    assert isinstance(page_size, int) and page_size > 0, \
+        "Page size must be a positive integer."
+    assert isinstance(page, int) and page > 0, \
+        "Page number must be a positive integer."
+    pages = read_pages(path, page_size, page, offset)
+    return prefetched(pages) if prefetch else pages
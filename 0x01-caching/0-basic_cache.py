@@ -24,14 +24,28 @@ from base_caching import BaseCaching
 class BasicCache(BaseCaching):
     """BasicCache defines a basic caching system without limit"""
 
-    def put(self, key, item):
-        """Add an item to the cache with the given key"""
+    def put(self, key, item, ttl=None):
+        """Add an item to the cache with the given key
+
+        Nothing is ever evicted: with a max_weight, the weight of the
+        items is tracked but not bounded.
+        """
         if key is None or item is None:
             return
-        self.cache_data[key] = item
+        self._sweep()
+        size = None
+        if self.max_weight is not None:
+            size = self.sizer(item)
+        self._store(key, item, size, ttl)
 
     def get(self, key):
         """Get an item from the cache by its key"""
-        if key is None or key not in self.cache_data:
+        if key is None or key not in self.cache_data or \
+                self._expired(key):
+            self.misses += 1
             return None
+        self.hits += 1
         return self.cache_data.get(key)
+
+    def _remove(self, key):
+        """Forget a key (there is no bookkeeping besides cache_data)"""
@@ -22,32 +22,42 @@ Example usage:
     print(cache.get("key4"))  # Output: item4
 """
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
 class FIFOCache(BaseCaching):
     """ FIFOCache defines a FIFO caching system """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """ Initialize the class """
-        super().__init__()
-        self.order = []
+        super().__init__(*args, **kwargs)
+        self.order = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """ Add an item in the cache """
         if key is None or item is None:
             return
-        if key not in self.cache_data and len(
-                self.cache_data) >= BaseCaching.MAX_ITEMS:
-            first_key = self.order.pop(0)
-            del self.cache_data[first_key]
-            print(f"DISCARD: {first_key}")
+        size = self._make_room(key, item)
         if key not in self.cache_data:
-            self.order.append(key)
-        self.cache_data[key] = item
+            self.order[key] = None
+        self._store(key, item, size, ttl)
 
     def get(self, key):
         """ Get an item by key """
-        if key is None or key not in self.cache_data:
+        if key is None or key not in self.cache_data or \
+                self._expired(key):
+            self.misses += 1
             return None
+        self.hits += 1
         return self.cache_data.get(key)
+
+    def _remove(self, key):
+        """ Forget a key """
+        del self.order[key]
+
+    def _evict(self):
+        """ Pop the first key put in the cache """
+        first_key, _ = self.order.popitem(last=False)
+        return first_key
@@ -8,9 +8,11 @@ caching system.
 It defines a single class, LFUCache, which inherits from BaseCaching and
 provides an LFU cache implementation.
 
-The LFUCache class uses a dictionary to store the cache data, a defaultdict to
-store the frequency of each key,
-and a list to store the order of access.
+The LFUCache class uses a dictionary to store the cache data, a dictionary
+to store the frequency of each key, and one frequency bucket per access
+count. Each bucket is an OrderedDict holding its keys in LRU order, and the
+lowest non-empty frequency is tracked so that get, put and eviction are
+all O(1).
 
 Example usage:
     >>> from lfu_cache import LFUCache
@@ -21,7 +23,7 @@ Example usage:
     'value1'
 """
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 from base_caching import BaseCaching
 
@@ -32,50 +34,78 @@ class LFUCache(BaseCaching):
 
     This class inherits from BaseCaching and provides an implementation
     of an LFU cache.
-    It uses a dictionary to store the cache data, a defaultdict to store
-    the frequency of each key,
-    and a list to store the order of access.
+    When the cache is full, the key with the lowest access count is
+    discarded; ties are broken by discarding the least recently used key.
 
     Attributes:
-        freq (defaultdict): A dictionary to store the frequency of each key.
-        order (list): A list to store the order of access.
+        freq (dict): The access count of each key.
+        buckets (defaultdict): Maps an access count to an OrderedDict of
+        the keys having that count, least recently used first.
+        min_freq (int): The lowest access count currently in the cache.
 
     Methods:
         put(key, item): Add an item to the cache.
         get(key): Get an item from the cache by key.
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Initialize the class"""
-        super().__init__()
-        self.freq = defaultdict(int)
-        self.order = []
+        super().__init__(*args, **kwargs)
+        self.freq = {}
+        self.buckets = defaultdict(OrderedDict)
+        self.min_freq = 0
 
-    def put(self, key, item):
+    def _touch(self, key):
+        """Move a key to the next frequency bucket"""
+        count = self.freq[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_freq == count:
+                self.min_freq = count + 1
+        self.freq[key] = count + 1
+        self.buckets[count + 1][key] = None
+
+    def put(self, key, item, ttl=None):
         """Add an item in the cache"""
         if key is None or item is None:
             return
+        size = self._make_room(key, item)
         if key in self.cache_data:
-            self.order.remove(key)
-        elif len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-            lfu_key = min(
-                self.order,
-                key=lambda k: (
-                    self.freq[k],
-                    self.order.index(k)))
-            del self.cache_data[lfu_key]
-            del self.freq[lfu_key]
-            self.order.remove(lfu_key)
-            print(f"DISCARD: {lfu_key}")
-        self.cache_data[key] = item
-        self.freq[key] += 1
-        self.order.append(key)
+            self._touch(key)
+        else:
+            self.freq[key] = 1
+            self.buckets[1][key] = None
+            self.min_freq = 1
+        self._store(key, item, size, ttl)
 
     def get(self, key):
         """Get an item by key"""
-        if key is None or key not in self.cache_data:
+        if key is None or key not in self.cache_data or \
+                self._expired(key):
+            self.misses += 1
             return None
-        self.freq[key] += 1
-        self.order.remove(key)
-        self.order.append(key)
+        self.hits += 1
+        self._touch(key)
         return self.cache_data.get(key)
+
+    def _remove(self, key):
+        """Forget a key"""
+        count = self.freq.pop(key)
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+
+    def _evict(self):
+        """Pop the least recently used of the least frequently used keys"""
+        if self.min_freq not in self.buckets:
+            # Only reached when one put evicts several keys
+            self.min_freq = min(self.buckets)
+        bucket = self.buckets[self.min_freq]
+        lfu_key, _ = bucket.popitem(last=False)
+        del self.freq[lfu_key]
+        if not bucket:
+            del self.buckets[self.min_freq]
+        return lfu_key
@@ -0,0 +1,21 @@
+#!/usr/bin/python3
+""" 101-main """
+TinyLFUCache = __import__('101-tinylfu_cache').TinyLFUCache
+
+my_cache = TinyLFUCache()
+my_cache.put("A", "Hello")
+my_cache.put("B", "World")
+my_cache.put("C", "Holberton")
+my_cache.put("D", "School")
+my_cache.print_cache()
+print(my_cache.get("B"))
+print(my_cache.get("B"))
+my_cache.put("E", "Battery")
+my_cache.print_cache()
+print(my_cache.get("E"))
+my_cache.put("F", "Mission")
+my_cache.print_cache()
+for key in "VWXYZ":
+    my_cache.put(key, key)
+my_cache.print_cache()
+print(my_cache.get("B"))
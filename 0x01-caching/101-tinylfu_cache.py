@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+TinyLFUCache module
+
+This module provides an implementation of the W-TinyLFU caching system,
+which keeps a hot working set cached through large one-off scans.
+
+New keys enter a small LRU window (1% of the capacity). A key pushed out
+of the window is only admitted to the main cache, a segmented LRU made of
+a probation and a protected segment, if it has been accessed more often
+than the key it would replace. Access frequencies are estimated by a
+count-min sketch whose counters are halved periodically, so that old
+popularity fades away.
+
+Classes:
+    CountMinSketch: An aging frequency estimator.
+    TinyLFUCache: A W-TinyLFU caching system.
+
+Example usage:
+    >>> TinyLFUCache = __import__('101-tinylfu_cache').TinyLFUCache
+    >>> cache = TinyLFUCache(1000)
+    >>> cache.put("key1", "value1")
+    >>> cache.get("key1")
+    'value1'
+"""
+
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+
+# Translation table halving every counter of a sketch row at once
+HALF = bytes(count >> 1 for count in range(256))
+
+
+class CountMinSketch:
+    """
+    CountMinSketch estimates how often keys have been seen.
+
+    It holds four rows of 4-bit saturating counters. A key increments
+    one counter per row, and its estimate is the smallest of them. The
+    key's hash is mixed down to 64 bits once, then each row multiplies it
+    by its own seed and takes the top bits of the 64-bit product, so the
+    rows pick their counters independently at any width. After
+    `sample_size` increments every counter is halved.
+
+    Attributes:
+        rows (list): The counters, one bytearray per row.
+        additions (int): Increments since the last halving.
+    """
+
+    MULTIPLIER = 0x9E3779B97F4A7C15
+    SEEDS = (0xBF58476D1CE4E5B9, 0x94D049BB133111EB,
+             0xD6E8FEB86659FD93, 0xC2B2AE3D27D4EB4F)
+    MAX_COUNT = 15
+
+    def __init__(self, capacity, sample_factor=10):
+        """Initialize the class"""
+        width = 1
+        while width < max(capacity, 16):
+            width <<= 1
+        self.shift = 64 - width.bit_length() + 1
+        self.rows = [bytearray(width) for _ in range(4)]
+        self.sample_size = sample_factor * max(capacity, 1)
+        self.additions = 0
+
+    def _indexes(self, key):
+        """Return the counter index of a key in each row"""
+        h = (hash(key) * self.MULTIPLIER) & 0xFFFFFFFFFFFFFFFF
+        h ^= h >> 32
+        shift = self.shift
+        s0, s1, s2, s3 = self.SEEDS
+        return (((h * s0) & 0xFFFFFFFFFFFFFFFF) >> shift,
+                ((h * s1) & 0xFFFFFFFFFFFFFFFF) >> shift,
+                ((h * s2) & 0xFFFFFFFFFFFFFFFF) >> shift,
+                ((h * s3) & 0xFFFFFFFFFFFFFFFF) >> shift)
+
+    def increment(self, key):
+        """Record one access to a key"""
+        i0, i1, i2, i3 = self._indexes(key)
+        r0, r1, r2, r3 = self.rows
+        if r0[i0] < self.MAX_COUNT:
+            r0[i0] += 1
+        if r1[i1] < self.MAX_COUNT:
+            r1[i1] += 1
+        if r2[i2] < self.MAX_COUNT:
+            r2[i2] += 1
+        if r3[i3] < self.MAX_COUNT:
+            r3[i3] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.age()
+
+    def estimate(self, key):
+        """Return the estimated access count of a key"""
+        i0, i1, i2, i3 = self._indexes(key)
+        r0, r1, r2, r3 = self.rows
+        return min(r0[i0], r1[i1], r2[i2], r3[i3])
+
+    def age(self):
+        """Halve every counter"""
+        for row in self.rows:
+            row[:] = row.translate(HALF)
+        self.additions //= 2
+
+
+class TinyLFUCache(BaseCaching):
+    """
+    TinyLFUCache defines a W-TinyLFU caching system.
+
+    This class inherits from BaseCaching. Keys live in one of three LRU
+    ordered segments: the admission window, then probation and protected.
+    A hit in probation promotes the key to protected; protected overflow
+    is demoted back to probation.
+
+    Attributes:
+        window (OrderedDict): The admission window, LRU first.
+        probation (OrderedDict): Main keys seen once, LRU first.
+        protected (OrderedDict): Main keys hit again, LRU first.
+        sketch (CountMinSketch): The access frequency estimator.
+
+    Methods:
+        put(key, item): Add an item to the cache.
+        get(key): Get an item from the cache by key.
+    """
+
+    WINDOW_RATIO = 0.01
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the class"""
+        super().__init__(*args, **kwargs)
+        self.window_size = max(1, int(self.max_items * self.WINDOW_RATIO))
+        main_size = max(self.max_items - self.window_size, 0)
+        self.protected_size = int(main_size * self.PROTECTED_RATIO)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(self.max_items)
+
+    def put(self, key, item, ttl=None):
+        """Add an item in the cache"""
+        if key is None or item is None:
+            return
+        size = self._make_room(key, item)
+        if key in self.cache_data:
+            self._hit(key)
+        else:
+            self.sketch.increment(key)
+            self.window[key] = None
+            if len(self.window) > self.window_size:
+                # Still warming up: the main cache has room
+                candidate, _ = self.window.popitem(last=False)
+                self.probation[candidate] = None
+        self._store(key, item, size, ttl)
+
+    def get(self, key):
+        """Get an item by key"""
+        if key is None:
+            self.misses += 1
+            return None
+        self.sketch.increment(key)
+        if key not in self.cache_data or self._expired(key):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._hit(key)
+        return self.cache_data.get(key)
+
+    def _hit(self, key):
+        """Move a cached key up after an access"""
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.probation:
+            del self.probation[key]
+            self.protected[key] = None
+            if len(self.protected) > self.protected_size:
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+        else:
+            self.protected.move_to_end(key)
+
+    def _remove(self, key):
+        """Forget a key"""
+        for segment in (self.window, self.probation, self.protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def _main_victim(self):
+        """Return the key the main cache would give up, or None"""
+        for segment in (self.probation, self.protected):
+            if segment:
+                return next(iter(segment))
+        return None
+
+    def _evict(self):
+        """Pick the victim between the window candidate and main victim"""
+        victim = self._main_victim()
+        if len(self.window) < self.window_size and victim is not None:
+            self._remove(victim)
+            return victim
+        candidate, _ = self.window.popitem(last=False)
+        if victim is None:
+            return candidate
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            self._remove(victim)
+            self.probation[candidate] = None
+            return victim
+        return candidate
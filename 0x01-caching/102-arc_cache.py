@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+ARCCache module
+
+This module provides an implementation of the Adaptive Replacement Cache
+(ARC), which balances recency against frequency on its own instead of
+committing to one of them like LRUCache and LFUCache do.
+
+Cached keys are split between T1 (seen once recently) and T2 (seen at
+least twice). Keys evicted from T1 and T2 are remembered, without their
+items, in the ghost lists B1 and B2. A put of a key found in B1 means T1
+was too small, so its target size `p` grows; a put of a key found in B2
+makes it shrink. Every operation is O(1).
+
+Classes:
+    ARCCache: An adaptive replacement caching system.
+
+Example usage:
+    >>> ARCCache = __import__('102-arc_cache').ARCCache
+    >>> cache = ARCCache(1000)
+    >>> cache.put("key1", "value1")
+    >>> cache.get("key1")
+    'value1'
+"""
+
+from collections import OrderedDict
+
+from base_caching import BaseCaching
+
+
+class ARCCache(BaseCaching):
+    """
+    ARCCache defines an Adaptive Replacement Cache.
+
+    This class inherits from BaseCaching. All four lists are OrderedDicts
+    kept in LRU order (least recently used first). The ghost lists are
+    trimmed so that T1 and B1 together hold at most max_items keys and all
+    four lists at most twice that.
+
+    Attributes:
+        t1 (OrderedDict): Cached keys accessed once.
+        t2 (OrderedDict): Cached keys accessed more than once.
+        b1 (OrderedDict): Ghosts of keys evicted from t1.
+        b2 (OrderedDict): Ghosts of keys evicted from t2.
+        p (float): The target size of t1.
+
+    Methods:
+        put(key, item): Add an item to the cache.
+        get(key): Get an item from the cache by key.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the class"""
+        super().__init__(*args, **kwargs)
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0
+        self.in_b2 = False
+
+    def put(self, key, item, ttl=None):
+        """Add an item in the cache"""
+        if key is None or item is None:
+            return
+        if key not in self.cache_data:
+            self._adapt(key)
+        size = self._make_room(key, item)
+        # A weighted update can evict the key itself to make room for its
+        # new item, so it may have become a ghost since _adapt ran
+        if key in self.cache_data:
+            self._hit(key)
+        elif key in self.b1 or key in self.b2:
+            self.b1.pop(key, None)
+            self.b2.pop(key, None)
+            self.t2[key] = None
+        else:
+            self.t1[key] = None
+        assert key not in self.b1 and key not in self.b2, \
+            "A cached key must not be a ghost."
+        self.in_b2 = False
+        self._trim()
+        self._store(key, item, size, ttl)
+
+    def get(self, key):
+        """Get an item by key"""
+        if key is None or key not in self.cache_data or \
+                self._expired(key):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._hit(key)
+        return self.cache_data.get(key)
+
+    def _hit(self, key):
+        """Move a cached key to the most recent end of t2"""
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        else:
+            self.t2.move_to_end(key)
+
+    def _adapt(self, key):
+        """Move the target size of t1 on a ghost hit"""
+        if key in self.b1:
+            delta = max(len(self.b2) / len(self.b1), 1)
+            self.p = min(self.p + delta, self.max_items)
+        elif key in self.b2:
+            delta = max(len(self.b1) / len(self.b2), 1)
+            self.p = max(self.p - delta, 0)
+            self.in_b2 = True
+
+    def _trim(self):
+        """Forget the oldest ghosts beyond the lists' budgets"""
+        while self.b1 and len(self.t1) + len(self.b1) > self.max_items:
+            self.b1.popitem(last=False)
+        while self.b2 and (len(self.t1) + len(self.t2) + len(self.b1) +
+                           len(self.b2) > 2 * self.max_items):
+            self.b2.popitem(last=False)
+
+    def _remove(self, key):
+        """Forget a key"""
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+
+    def _evict(self):
+        """Evict from t1 or t2, depending on the target size of t1"""
+        if self.t1 and (len(self.t1) > self.p or not self.t2 or
+                        (self.in_b2 and len(self.t1) == int(self.p))):
+            key, _ = self.t1.popitem(last=False)
+            self.b1[key] = None
+        else:
+            key, _ = self.t2.popitem(last=False)
+            self.b2[key] = None
+        return key
@@ -18,6 +18,8 @@ Examples:
     DISCARD: key1
 """
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -26,28 +28,38 @@ class LIFOCache(BaseCaching):
     LIFOCache defines a LIFO (Last In First Out) caching system.
 
     This class inherits from BaseCaching and implements a LIFO caching system.
-    It keeps track of the last key added to the cache and discards it when the
-    cache is full.
+    It keeps the keys in a stack ordered by their last put and discards
+    the top of the stack (the last key added) when the cache is full.
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Initialize the class"""
-        super().__init__()
-        self.last_key = None
+        super().__init__(*args, **kwargs)
+        self.stack = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Add an item to the cache with the given key"""
         if key is None or item is None:
             return
-        if key not in self.cache_data and len(
-                self.cache_data) >= BaseCaching.MAX_ITEMS:
-            del self.cache_data[self.last_key]
-            print(f"DISCARD: {self.last_key}")
-        self.cache_data[key] = item
-        self.last_key = key
+        size = self._make_room(key, item)
+        self.stack[key] = None
+        self.stack.move_to_end(key)
+        self._store(key, item, size, ttl)
 
     def get(self, key):
         """Get an item by key"""
-        if key is None or key not in self.cache_data:
+        if key is None or key not in self.cache_data or \
+                self._expired(key):
+            self.misses += 1
             return None
+        self.hits += 1
         return self.cache_data.get(key)
+
+    def _remove(self, key):
+        """Forget a key"""
+        del self.stack[key]
+
+    def _evict(self):
+        """Pop the last key put in the cache"""
+        last_key, _ = self.stack.popitem()
+        return last_key
@@ -4,14 +4,17 @@ LRUCache module
 
 This module implements a LRU (Least Recently Used) caching system.
 
-It provides a LRUCache class that inherits from BaseCaching and uses a list
-to keep track of the order of access.
+It provides a LRUCache class that inherits from BaseCaching and uses an
+OrderedDict (a hash map threaded through a doubly linked list) to keep
+track of the order of access, so get, put and eviction are all O(1).
 
 Classes:
     LRUCache: A LRU caching system.
 
 """
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -20,40 +23,50 @@ class LRUCache(BaseCaching):
     LRUCache defines a LRU (Least Recently Used) caching system.
 
     This class inherits from BaseCaching and implements a LRU cache
-    using a list
-    to keep track of the order of access.
+    using an OrderedDict to keep track of the order of access.
+    The least recently used key is always at the front of the order,
+    the most recently used one at the back.
 
     Attributes:
         cache_data (dict): A dictionary to store the cached data.
-        order (list): A list to keep track of the order of access.
+        order (OrderedDict): The keys in the order of access.
 
     Methods:
         put(key, item): Add an item to the cache.
         get(key): Get an item from the cache.
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Initialize the class"""
-        super().__init__()
-        self.order = []
+        super().__init__(*args, **kwargs)
+        self.order = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Add an item in the cache"""
         if key is None or item is None:
             return
+        size = self._make_room(key, item)
         if key in self.cache_data:
-            self.order.remove(key)
-        elif len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-            lru_key = self.order.pop(0)
-            del self.cache_data[lru_key]
-            print(f"DISCARD: {lru_key}")
-        self.cache_data[key] = item
-        self.order.append(key)
+            self.order.move_to_end(key)
+        else:
+            self.order[key] = None
+        self._store(key, item, size, ttl)
 
     def get(self, key):
         """Get an item by key"""
-        if key is None or key not in self.cache_data:
+        if key is None or key not in self.cache_data or \
+                self._expired(key):
+            self.misses += 1
             return None
-        self.order.remove(key)
-        self.order.append(key)
+        self.hits += 1
+        self.order.move_to_end(key)
         return self.cache_data.get(key)
+
+    def _remove(self, key):
+        """Forget a key"""
+        del self.order[key]
+
+    def _evict(self):
+        """Pop the least recently used key"""
+        lru_key, _ = self.order.popitem(last=False)
+        return lru_key
@@ -7,13 +7,15 @@ This module provides an implementation of a Most Recently
 Used (MRU) caching system.
 The MRUCache class inherits from BaseCaching and provides
 a cache storage dictionary
-and an order list to maintain the order of access.
+and an OrderedDict to maintain the order of access.
 
 Classes:
     MRUCache: A Most Recently Used (MRU) caching system.
 
 """
 
+from collections import OrderedDict
+
 from base_caching import BaseCaching
 
 
@@ -24,41 +26,50 @@ class MRUCache(BaseCaching):
     This class inherits from BaseCaching and provides an implementation
     of an MRU cache.
     The cache stores items in a dictionary and maintains an order of
-    access using a list.
+    access using an OrderedDict.
     When the cache is full and a new item is added, the least recently
     used item is discarded.
 
     Attributes:
         cache_data (dict): The cache storage dictionary.
-        order (list): The list of keys in the order of access.
+        order (OrderedDict): The keys in the order of access.
 
     Methods:
         put(key, item): Adds an item to the cache.
         get(key): Retrieves an item from the cache.
     """
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
         """Initialize the class"""
-        super().__init__()
-        self.order = []
+        super().__init__(*args, **kwargs)
+        self.order = OrderedDict()
 
-    def put(self, key, item):
+    def put(self, key, item, ttl=None):
         """Add an item in the cache"""
         if key is None or item is None:
             return
+        size = self._make_room(key, item)
         if key in self.cache_data:
-            self.order.remove(key)
-        elif len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-            mru_key = self.order.pop()
-            del self.cache_data[mru_key]
-            print(f"DISCARD: {mru_key}")
-        self.cache_data[key] = item
-        self.order.append(key)
+            self.order.move_to_end(key)
+        else:
+            self.order[key] = None
+        self._store(key, item, size, ttl)
 
     def get(self, key):
         """Get an item by key"""
-        if key is None or key not in self.cache_data:
+        if key is None or key not in self.cache_data or \
+                self._expired(key):
+            self.misses += 1
             return None
-        self.order.remove(key)
-        self.order.append(key)
+        self.hits += 1
+        self.order.move_to_end(key)
         return self.cache_data.get(key)
+
+    def _remove(self, key):
+        """Forget a key"""
+        del self.order[key]
+
+    def _evict(self):
+        """Pop the most recently used key"""
+        mru_key, _ = self.order.popitem()
+        return mru_key
@@ -2,18 +2,145 @@
 """ BaseCaching module
 """
 
+import heapq
+import itertools
+import sys
+import threading
+import time
+from collections import defaultdict
+
+
+def print_discard(key, item):
+    """Report an evicted key on stdout (the default eviction listener)"""
+    print(f"DISCARD: {key}")
+
+
+def ignore_discard(key, item):
+    """Eviction listener that does nothing"""
+
+
+class BatchListener:
+    """Eviction listener that hands evictions to `handler` in batches
+
+    Evicted (key, item) pairs are buffered and passed as one list to
+    `handler` every `size` evictions, or when `flush` is called.
+    """
+
+    def __init__(self, handler, size=1024):
+        """Initiliaze"""
+        self.handler = handler
+        self.size = size
+        self.batch = []
+        self.lock = threading.Lock()
+
+    def __call__(self, key, item):
+        """Buffer one eviction"""
+        with self.lock:
+            self.batch.append((key, item))
+            if len(self.batch) < self.size:
+                return
+            batch, self.batch = self.batch, []
+        self.handler(batch)
+
+    def flush(self):
+        """Hand over the buffered evictions now"""
+        with self.lock:
+            batch, self.batch = self.batch, []
+        if batch:
+            self.handler(batch)
+
+
+class LatencyHistogram:
+    """Log2-bucketed histogram of sampled call latencies
+
+    One call in `every` is timed; bucket i counts the calls that took
+    less than 2 ** i nanoseconds (and at least 2 ** (i - 1)).
+    """
+
+    def __init__(self, every):
+        """Initiliaze"""
+        self.every = every
+        self.calls = 0
+        self.buckets = [0] * 65
+
+    def wrap(self, method):
+        """Return `method` timed one call in `every`"""
+        def timed(*args, **kwargs):
+            """Call the wrapped method, timing it if sampled"""
+            self.calls += 1
+            if self.calls % self.every:
+                return method(*args, **kwargs)
+            start = time.perf_counter_ns()
+            result = method(*args, **kwargs)
+            elapsed = time.perf_counter_ns() - start
+            self.buckets[elapsed.bit_length()] += 1
+            return result
+        return timed
+
+    def summary(self):
+        """Return {upper bound in ns: sampled calls} for non-empty buckets"""
+        return {1 << i: n for i, n in enumerate(self.buckets) if n}
+
+    def reset(self):
+        """Forget every sample"""
+        self.calls = 0
+        self.buckets = [0] * 65
+
 
 class BaseCaching:
     """BaseCaching defines:
     - constants of your caching system
     - where your data are stored (in a dictionary)
+
+    A cache is bounded by `max_items` entries (MAX_ITEMS by default) and,
+    optionally, by `max_weight`: the total size of the cached items as
+    measured by `sizer` (sys.getsizeof by default, in bytes).
+    Bounded caches implement `_evict`, which removes the policy's victim
+    from its own bookkeeping and returns its key.
+
+    Entries put with a `ttl` (or under the cache's default `ttl`), in
+    seconds, expire: they are dropped when a get finds them expired, and
+    each put first reclaims up to SWEEP_BATCH expired entries from a heap
+    of deadlines, so expiry never scans the cache. `expire` reclaims all
+    of them at once. Bounded caches implement `_remove`, which forgets an
+    expired key in the policy's bookkeeping.
+
+    Every eviction is counted in `evictions`, by reason ("size", "weight"
+    or "expired"), and reported to `listener`, a callable taking the evicted
+    key and item. It defaults to print_discard; use ignore_discard or a
+    BatchListener to keep terminal I/O off the put path.
+
+    Hits, misses, puts and updates are counted too, and reported with the
+    evictions and sizes by `stats`. Passing `latency_sample=n` also times
+    one get/put call in n into a LatencyHistogram.
     """
 
     MAX_ITEMS = 4
+    SWEEP_BATCH = 16
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_weight=None, sizer=None,
+                 listener=print_discard, latency_sample=None, ttl=None):
         """Initiliaze"""
         self.cache_data = {}
+        self.max_items = self.MAX_ITEMS if max_items is None else max_items
+        self.max_weight = max_weight
+        self.sizer = sys.getsizeof if sizer is None else sizer
+        self.weight = 0
+        self.weights = {}
+        self.listener = listener
+        self.ttl = ttl
+        self.expiries = {}
+        self.expiry_heap = []
+        self.expiry_seq = itertools.count()
+        self.latency = None
+        if latency_sample:
+            self.latency = {
+                "get": LatencyHistogram(latency_sample),
+                "put": LatencyHistogram(latency_sample),
+            }
+            self.get = self.latency["get"].wrap(self.get)
+            self.put = self.latency["put"].wrap(self.put)
+        self.reset_stats()
 
     def print_cache(self):
         """Print the cache"""
@@ -21,7 +148,55 @@ class BaseCaching:
         for key in sorted(self.cache_data.keys()):
             print("{}: {}".format(key, self.cache_data.get(key)))
 
-    def put(self, key, item):
+    def stats(self):
+        """Return the cache's counters and sizes as a dictionary"""
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "puts": self.puts,
+            "updates": self.updates,
+            "evictions": dict(self.evictions),
+            "size": len(self.cache_data),
+            "peak_size": self.peak_size,
+        }
+        if self.max_weight is not None:
+            stats["weight"] = self.weight
+        if self.latency is not None:
+            stats["latency_ns"] = {
+                op: histogram.summary()
+                for op, histogram in self.latency.items()
+            }
+        return stats
+
+    def reset_stats(self):
+        """Zero the counters; the peak size restarts from the current size"""
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.updates = 0
+        self.evictions = defaultdict(int)
+        self.peak_size = len(self.cache_data)
+        if self.latency is not None:
+            for histogram in self.latency.values():
+                histogram.reset()
+
+    def expire(self, limit=None):
+        """Drop expired entries, at most `limit` of them; return how many"""
+        now = time.monotonic()
+        heap = self.expiry_heap
+        dropped = 0
+        while heap and heap[0][0] <= now and dropped != limit:
+            deadline, _, key = heapq.heappop(heap)
+            if self.expiries.get(key) == deadline:
+                self._remove(key)
+                self._discard(key, "expired")
+                dropped += 1
+        self._compact()
+        return dropped
+
+    def put(self, key, item, ttl=None):
         """Add an item in the cache"""
         raise NotImplementedError(
             "put must be implemented in your cache class")
@@ -30,3 +205,106 @@ class BaseCaching:
         """Get an item by key"""
         raise NotImplementedError(
             "get must be implemented in your cache class")
+
+    def _evict(self):
+        """Remove the policy's victim from its bookkeeping, return its key"""
+        raise NotImplementedError(
+            "_evict must be implemented in your cache class")
+
+    def _remove(self, key):
+        """Remove a key from the policy's bookkeeping"""
+        raise NotImplementedError(
+            "_remove must be implemented in your cache class")
+
+    def _sweep(self):
+        """Reclaim a batch of expired entries if any deadline has passed"""
+        if self.expiry_heap and self.expiry_heap[0][0] <= time.monotonic():
+            self.expire(self.SWEEP_BATCH)
+
+    def _compact(self):
+        """Rebuild the deadline heap once stale deadlines outnumber live ones
+
+        Updates, evictions and expiries leave their old deadlines in the
+        heap, so it is checked on every put: its size stays proportional
+        to the live deadlines whether or not any of them is due.
+        """
+        if len(self.expiry_heap) > 2 * len(self.expiries) + self.SWEEP_BATCH:
+            self.expiry_heap = [
+                (deadline, next(self.expiry_seq), key)
+                for key, deadline in self.expiries.items()
+            ]
+            heapq.heapify(self.expiry_heap)
+
+    def _expired(self, key):
+        """Drop `key` and return True if it has expired"""
+        if not self.expiries:
+            return False
+        deadline = self.expiries.get(key)
+        if deadline is None or deadline > time.monotonic():
+            return False
+        self._remove(key)
+        self._discard(key, "expired")
+        return True
+
+    def _make_room(self, key, item):
+        """Evict entries until `item` fits in the cache under `key`
+
+        Returns the size of `item` when the cache is weighted, else None.
+        An item larger than max_weight empties the cache and is then
+        stored on its own.
+        """
+        self._sweep()
+        size = None
+        count = len(self.cache_data) + (key not in self.cache_data)
+        if self.max_weight is None:
+            while count > self.max_items and self.cache_data:
+                self._discard(self._evict(), "size")
+                count = len(self.cache_data) + (key not in self.cache_data)
+            return size
+        size = self.sizer(item)
+        while self.cache_data:
+            if count > self.max_items:
+                reason = "size"
+            elif (self.weight - self.weights.get(key, 0) + size >
+                    self.max_weight):
+                reason = "weight"
+            else:
+                break
+            self._discard(self._evict(), reason)
+            count = len(self.cache_data) + (key not in self.cache_data)
+        return size
+
+    def _store(self, key, item, size=None, ttl=None):
+        """Write an item, account for its weight and set its deadline"""
+        if ttl is None:
+            ttl = self.ttl
+        if ttl is not None:
+            deadline = time.monotonic() + ttl
+            self.expiries[key] = deadline
+            heapq.heappush(self.expiry_heap,
+                           (deadline, next(self.expiry_seq), key))
+        elif self.expiries:
+            self.expiries.pop(key, None)
+        if self.expiry_heap:
+            self._compact()
+        if self.max_weight is not None:
+            self.weight += size - self.weights.get(key, 0)
+            self.weights[key] = size
+        self.puts += 1
+        if key in self.cache_data:
+            self.updates += 1
+            self.cache_data[key] = item
+            return
+        self.cache_data[key] = item
+        if len(self.cache_data) > self.peak_size:
+            self.peak_size = len(self.cache_data)
+
+    def _discard(self, key, reason):
+        """Drop an evicted key from the cache and report it"""
+        item = self.cache_data.pop(key)
+        if self.max_weight is not None:
+            self.weight -= self.weights.pop(key)
+        if self.expiries:
+            self.expiries.pop(key, None)
+        self.evictions[reason] += 1
+        self.listener(key, item)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Stress test and throughput benchmark for ConcurrentCache.
+
+For every policy, hammers a ConcurrentCache from several threads with a
+mix of gets and puts, then checks that each segment is still consistent:
+no thread raised, the cache is within its capacity and the policy's
+bookkeeping tracks exactly the keys in cache_data. Throughput is reported
+for 1 and N segments at each thread count.
+
+Usage:
+    ./bench_concurrent_cache.py [ops_per_thread]
+"""
+
+import random
+import sys
+import threading
+import time
+
+from base_caching import ignore_discard
+from concurrent_cache import ConcurrentCache
+
+POLICIES = [
+    (__import__('1-fifo_cache').FIFOCache, "order"),
+    (__import__('2-lifo_cache').LIFOCache, "stack"),
+    (__import__('3-lru_cache').LRUCache, "order"),
+    (__import__('4-mru_cache').MRUCache, "order"),
+    (__import__('100-lfu_cache').LFUCache, "freq"),
+]
+CAPACITY = 1000
+THREADS = [1, 2, 4, 8]
+SEGMENTS = [1, 16]
+
+
+def worker(cache, ops, seed, errors):
+    """Run a random mix of gets and puts against the cache"""
+    rng = random.Random(seed)
+    try:
+        for _ in range(ops):
+            key = rng.randrange(CAPACITY * 4)
+            if cache.get(key) is None:
+                cache.put(key, key)
+    except Exception as e:
+        errors.append(e)
+
+
+def run(cache, threads, ops):
+    """Run the workers; return (seconds, errors)"""
+    errors = []
+    pool = [threading.Thread(target=worker, args=(cache, ops, i, errors))
+            for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, errors
+
+
+def check(cache, bookkeeping):
+    """Assert that every segment is consistent"""
+    for segment in cache.segments:
+        assert len(segment.cache_data) <= segment.max_items
+        assert set(getattr(segment, bookkeeping)) == set(segment.cache_data)
+
+
+def main():
+    """Run the stress test and print the throughput table"""
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("{:>10} {:>8} {:>8} {:>12}".format(
+        "policy", "threads", "segments", "ops/sec"))
+    for policy, bookkeeping in POLICIES:
+        for threads in THREADS:
+            for segments in SEGMENTS:
+                cache = ConcurrentCache(policy, CAPACITY, segments=segments,
+                                        listener=ignore_discard)
+                elapsed, errors = run(cache, threads, ops)
+                assert not errors, errors
+                check(cache, bookkeeping)
+                print("{:>10} {:>8} {:>8} {:>12.0f}".format(
+                    policy.__name__, threads, segments,
+                    threads * ops / elapsed))
+
+
+if __name__ == "__main__":
+    main()
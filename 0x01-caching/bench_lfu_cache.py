@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the LFU caching system.
+
+Replays a Zipfian trace against the frequency-bucket LFUCache and against
+the previous list-based implementation (kept here as ListLFUCache) and
+prints the hit ratio and throughput of each. Both must report the same
+number of hits, since they implement the same eviction policy.
+
+Usage:
+    ./bench_lfu_cache.py [capacity] [ops]
+"""
+
+import bisect
+import itertools
+import random
+import sys
+import time
+
+from base_caching import BaseCaching, ignore_discard
+
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+
+class ListLFUCache(BaseCaching):
+    """The original LFU cache: O(n) get and O(n^2) eviction"""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the class"""
+        super().__init__(*args, **kwargs)
+        self.freq = {}
+        self.order = []
+
+    def put(self, key, item):
+        """Add an item in the cache"""
+        if key is None or item is None:
+            return
+        if key in self.cache_data:
+            self.order.remove(key)
+        elif len(self.cache_data) >= self.max_items:
+            lfu_key = min(
+                self.order,
+                key=lambda k: (self.freq[k], self.order.index(k)))
+            lfu_item = self.cache_data.pop(lfu_key)
+            del self.freq[lfu_key]
+            self.order.remove(lfu_key)
+            self.listener(lfu_key, lfu_item)
+        self.cache_data[key] = item
+        self.freq[key] = self.freq.get(key, 0) + 1
+        self.order.append(key)
+
+    def get(self, key):
+        """Get an item by key"""
+        if key is None or key not in self.cache_data:
+            return None
+        self.freq[key] += 1
+        self.order.remove(key)
+        self.order.append(key)
+        return self.cache_data.get(key)
+
+
+def zipf_trace(n_keys, ops, s=1.1, seed=0):
+    """Return `ops` keys drawn from a Zipf(s) distribution over n_keys"""
+    weights = [1 / (rank ** s) for rank in range(1, n_keys + 1)]
+    cumulative = list(itertools.accumulate(weights))
+    rng = random.Random(seed)
+    total = cumulative[-1]
+    return [bisect.bisect(cumulative, rng.random() * total)
+            for _ in range(ops)]
+
+
+def replay(cls, capacity, trace):
+    """Replay a trace as get-then-put-on-miss; return (hits, seconds)"""
+    cache = cls(capacity, listener=ignore_discard)
+    hits = 0
+    start = time.perf_counter()
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return hits, elapsed
+
+
+def main():
+    """Run the benchmark and print one line per implementation"""
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    trace = zipf_trace(capacity * 10, ops)
+    print("capacity={} ops={}".format(capacity, ops))
+    print("{:>14} {:>10} {:>12}".format("policy", "hit ratio", "ops/sec"))
+    results = {}
+    for cls in (ListLFUCache, LFUCache):
+        hits, elapsed = replay(cls, capacity, trace)
+        results[cls.__name__] = hits
+        print("{:>14} {:>10.4f} {:>12.0f}".format(
+            cls.__name__, hits / ops, ops / elapsed))
+    assert len(set(results.values())) == 1, "implementations disagree"
+
+
+if __name__ == "__main__":
+    main()
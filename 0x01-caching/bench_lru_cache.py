@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the LRU caching system.
+
+Fills an LRUCache to capacity and then measures the mean latency of
+cache hits (get) and of puts that force an eviction, for capacities
+ranging from 4 to 1,000,000 entries. With O(1) promotion and eviction
+the per-operation latency should stay flat as the capacity grows.
+
+Usage:
+    ./bench_lru_cache.py [ops]
+"""
+
+import sys
+import time
+
+from base_caching import ignore_discard
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+CAPACITIES = [4, 100, 10000, 100000, 1000000]
+
+
+def bench(capacity, ops):
+    """Return the mean (get, evicting put) latency in nanoseconds"""
+    cache = LRUCache(capacity, listener=ignore_discard)
+    for i in range(capacity):
+        cache.put(i, i)
+
+    keys = [i % capacity for i in range(ops)]
+    start = time.perf_counter_ns()
+    for key in keys:
+        cache.get(key)
+    get_ns = (time.perf_counter_ns() - start) / ops
+
+    start = time.perf_counter_ns()
+    for i in range(capacity, capacity + ops):
+        cache.put(i, i)
+    put_ns = (time.perf_counter_ns() - start) / ops
+    return get_ns, put_ns
+
+
+def main():
+    """Run the benchmark and print one line per capacity"""
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("{:>10} {:>12} {:>12}".format(
+        "capacity", "get ns/op", "put ns/op"))
+    for capacity in CAPACITIES:
+        get_ns, put_ns = bench(capacity, ops)
+        print("{:>10} {:>12.1f} {:>12.1f}".format(capacity, get_ns, put_ns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Trace-replay benchmark comparing the caching policies.
+
+Replays synthetic access traces against every policy, as a get followed
+by a put on miss, and prints the hit ratio and throughput of each:
+
+- zipf: a skewed working set (Zipf, s=1.1, over 10x the capacity).
+- scan: the same working set interrupted by long sequential scans of
+  keys that are never seen again, like paging through a whole dataset.
+- loop: a cyclic scan slightly larger than the cache.
+
+Usage:
+    ./bench_policies.py [capacity] [ops]
+"""
+
+import sys
+import time
+
+from base_caching import ignore_discard
+from bench_lfu_cache import zipf_trace
+
+POLICIES = [
+    __import__('1-fifo_cache').FIFOCache,
+    __import__('2-lifo_cache').LIFOCache,
+    __import__('3-lru_cache').LRUCache,
+    __import__('4-mru_cache').MRUCache,
+    __import__('100-lfu_cache').LFUCache,
+    __import__('101-tinylfu_cache').TinyLFUCache,
+    __import__('102-arc_cache').ARCCache,
+]
+
+
+def scan_trace(capacity, ops):
+    """Return a Zipf trace where every other stretch is a one-off scan"""
+    hot = zipf_trace(capacity * 10, ops)
+    trace = []
+    scan_key = capacity * 10
+    stretch = capacity * 2
+    for start in range(0, ops, stretch):
+        if (start // stretch) % 2:
+            trace.extend(range(scan_key, scan_key + stretch))
+            scan_key += stretch
+        else:
+            trace.extend(hot[start:start + stretch])
+    return trace[:ops]
+
+
+def loop_trace(capacity, ops):
+    """Return a cyclic scan over 1.5x the capacity"""
+    span = capacity + capacity // 2
+    return [i % span for i in range(ops)]
+
+
+TRACES = {
+    "zipf": lambda capacity, ops: zipf_trace(capacity * 10, ops),
+    "scan": scan_trace,
+    "loop": loop_trace,
+}
+
+
+def replay(cls, capacity, trace):
+    """Replay a trace as get-then-put-on-miss; return (hit ratio, ops/s)"""
+    cache = cls(capacity, listener=ignore_discard)
+    start = time.perf_counter()
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, key)
+    elapsed = time.perf_counter() - start
+    return cache.stats()["hit_ratio"], len(trace) / elapsed
+
+
+def main():
+    """Run every trace against every policy and print the results"""
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    print("capacity={} ops={}".format(capacity, ops))
+    print("{:>6} {:>14} {:>10} {:>12}".format(
+        "trace", "policy", "hit ratio", "ops/sec"))
+    for name, make_trace in TRACES.items():
+        trace = make_trace(capacity, ops)
+        for cls in POLICIES:
+            hit_ratio, throughput = replay(cls, capacity, trace)
+            print("{:>6} {:>14} {:>10.4f} {:>12.0f}".format(
+                name, cls.__name__, hit_ratio, throughput))
+
+
+if __name__ == "__main__":
+    main()
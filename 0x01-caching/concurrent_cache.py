@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Concurrent cache module
+
+This module provides ConcurrentCache, a thread-safe front for any of the
+caching policies. Keys are sharded by hash across N segments; each segment
+is an independent instance of the chosen policy guarded by its own lock,
+so threads working on different segments never wait for each other.
+
+With a single segment the policy is applied exactly, behind one lock.
+With several segments each one applies the policy to its own share of
+the keys and of the capacity.
+
+Example usage:
+    >>> LRUCache = __import__('3-lru_cache').LRUCache
+    >>> cache = ConcurrentCache(LRUCache, 100000, segments=16)
+    >>> cache.put("key1", "value1")
+    >>> cache.get("key1")
+    'value1'
+"""
+
+import threading
+
+from base_caching import BaseCaching
+
+
+def share(budget, segments, i):
+    """Return segment i's share of a budget split across segments"""
+    if budget is None:
+        return None
+    return budget // segments + (i < budget % segments)
+
+
+class ConcurrentCache:
+    """
+    ConcurrentCache defines a lock-striped caching system.
+
+    It exposes the BaseCaching interface (put, get, print_cache) and
+    forwards each call to the segment owning the key, under that
+    segment's lock.
+
+    Attributes:
+        segments (list): The policy instances, one per segment.
+        locks (list): The lock guarding each segment.
+
+    Methods:
+        put(key, item): Add an item to the cache.
+        get(key): Get an item from the cache by key.
+    """
+
+    def __init__(self, policy, max_items=None, segments=1,
+                 max_weight=None, **kwargs):
+        """Initialize the class
+
+        `max_items` and `max_weight` are the budgets of the whole cache;
+        they are shared out exactly across the segments, the first ones
+        taking the remainder, so each must be at least `segments`. Other
+        keyword arguments are passed to each policy instance.
+        """
+        if max_items is None:
+            max_items = BaseCaching.MAX_ITEMS
+        assert 0 < segments <= max_items, \
+            "There must be between 1 and max_items segments."
+        assert max_weight is None or segments <= max_weight, \
+            "There must be at most max_weight segments."
+        self.segments = [
+            policy(share(max_items, segments, i),
+                   max_weight=share(max_weight, segments, i), **kwargs)
+            for i in range(segments)
+        ]
+        self.locks = [threading.Lock() for _ in range(segments)]
+
+    def _segment(self, key):
+        """Return the index of the segment owning a key"""
+        return hash(key) % len(self.segments)
+
+    def put(self, key, item, ttl=None):
+        """Add an item in the cache"""
+        if key is None or item is None:
+            return
+        i = self._segment(key)
+        with self.locks[i]:
+            self.segments[i].put(key, item, ttl)
+
+    def get(self, key):
+        """Get an item by key"""
+        if key is None:
+            return None
+        i = self._segment(key)
+        with self.locks[i]:
+            return self.segments[i].get(key)
+
+    def expire(self):
+        """Drop the expired entries of every segment; return how many"""
+        dropped = 0
+        for lock, segment in zip(self.locks, self.segments):
+            with lock:
+                dropped += segment.expire()
+        return dropped
+
+    def start_reaper(self, interval):
+        """Call `expire` every `interval` seconds on a daemon thread
+
+        Returns a threading.Event; set it to stop the thread.
+        """
+        stop = threading.Event()
+
+        def reap():
+            """Expire entries until stopped"""
+            while not stop.wait(interval):
+                self.expire()
+
+        threading.Thread(target=reap, daemon=True).start()
+        return stop
+
+    def stats(self):
+        """Return the counters and sizes summed over the segments
+
+        The peak size is the sum of the segments' peaks, an upper bound
+        of the whole cache's peak.
+        """
+        total = {}
+        for lock, segment in zip(self.locks, self.segments):
+            with lock:
+                stats = segment.stats()
+            for name, value in stats.items():
+                if name == "hit_ratio":
+                    continue
+                if isinstance(value, dict):
+                    merged = total.setdefault(name, {})
+                    for key, count in value.items():
+                        if isinstance(count, dict):
+                            bucket = merged.setdefault(key, {})
+                            for bound, n in count.items():
+                                bucket[bound] = bucket.get(bound, 0) + n
+                        else:
+                            merged[key] = merged.get(key, 0) + count
+                else:
+                    total[name] = total.get(name, 0) + value
+        lookups = total["hits"] + total["misses"]
+        total["hit_ratio"] = total["hits"] / lookups if lookups else 0.0
+        return total
+
+    def reset_stats(self):
+        """Zero the counters of every segment"""
+        for lock, segment in zip(self.locks, self.segments):
+            with lock:
+                segment.reset_stats()
+
+    def __len__(self):
+        """Return the number of cached items"""
+        return sum(len(segment.cache_data) for segment in self.segments)
+
+    def print_cache(self):
+        """Print the cache"""
+        cache_data = {}
+        for lock, segment in zip(self.locks, self.segments):
+            with lock:
+                cache_data.update(segment.cache_data)
+        print("Current cache:")
+        for key in sorted(cache_data.keys()):
+            print("{}: {}".format(key, cache_data.get(key)))
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Memoize module
+
+This module provides `memoize`, a decorator caching the results of a
+function in any of the caching policies, so that expensive calls are only
+computed once per distinct arguments.
+
+Concurrent callers asking for the same key while it is being computed
+wait for that computation instead of starting their own (single-flight).
+Coroutine functions are supported the same way.
+
+Example usage:
+    >>> LFUCache = __import__('100-lfu_cache').LFUCache
+    >>> @memoize(LFUCache(1000, listener=ignore_discard))
+    ... def square(n):
+    ...     return n * n
+    >>> square(4)
+    16
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+
+from base_caching import ignore_discard
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+KWARGS_MARK = object()
+
+
+def make_key(args, kwargs, typed=False):
+    """Build a hashable cache key out of call arguments
+
+    With `typed`, arguments of different types are cached separately,
+    e.g. f(3) and f(3.0).
+    """
+    key = args
+    if kwargs:
+        key += (KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        if kwargs:
+            key += tuple(type(value) for _, value in sorted(kwargs.items()))
+    if len(key) == 1 and type(key[0]) in (int, str):
+        return key[0]
+    return key
+
+
+def memoize(cache=None, typed=False, ttl=None):
+    """Return a decorator caching results in `cache`
+
+    `cache` is any BaseCaching policy (or a ConcurrentCache); by default
+    a 128 entry LRUCache that does not report evictions. Results are
+    stored for `ttl` seconds when given. The decorated function exposes
+    the cache as its `cache` attribute.
+    """
+    if cache is None:
+        cache = LRUCache(128, listener=ignore_discard)
+
+    def decorator(func):
+        """Wrap `func` in the cache"""
+        lock = threading.Lock()
+        inflight = {}
+
+        def lookup(key):
+            """Return (cached result,) or None"""
+            with lock:
+                return cache.get(key)
+
+        def store(key, result):
+            """Cache a result, wrapped so that None can be cached too"""
+            with lock:
+                cache.put(key, (result,), ttl)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                """Return the cached result, or await and cache it"""
+                key = make_key(args, kwargs, typed)
+                while True:
+                    hit = lookup(key)
+                    if hit is not None:
+                        return hit[0]
+                    future = inflight.get(key)
+                    if future is None:
+                        break
+                    try:
+                        return await asyncio.shield(future)
+                    except asyncio.CancelledError:
+                        if not future.cancelled():
+                            raise
+                        # The caller computing it was cancelled, not
+                        # this one: look again, and compute it if no
+                        # other waiter has started to
+                future = asyncio.get_running_loop().create_future()
+                inflight[key] = future
+                try:
+                    result = await func(*args, **kwargs)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except BaseException as e:
+                    future.set_exception(e)
+                    # Mark the exception retrieved when nobody waits on it
+                    future.exception()
+                    raise
+                else:
+                    store(key, result)
+                    future.set_result(result)
+                    return result
+                finally:
+                    del inflight[key]
+
+            async_wrapper.cache = cache
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            """Return the cached result, or compute and cache it"""
+            key = make_key(args, kwargs, typed)
+            with lock:
+                hit = cache.get(key)
+                if hit is not None:
+                    return hit[0]
+                future = inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = inflight[key] = Future()
+            if not leader:
+                return future.result()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            else:
+                store(key, result)
+                future.set_result(result)
+                return result
+            finally:
+                with lock:
+                    del inflight[key]
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -7,12 +7,22 @@ This module defines a Flask application that serves a single page,
 the index page, and mocks user login functionality.
 """
 
-from datetime import datetime
+import hashlib
+import os
+from datetime import datetime, tzinfo
+from typing import Tuple
 
-import pytz
-from flask import Flask, g, render_template, request
-from flask_babel import Babel, _
-from pytz.exceptions import UnknownTimeZoneError
+from flask import Flask, g, make_response, render_template, request
+from flask_babel import Babel
+from flask_babel import get_locale as current_locale
+from markupsafe import escape
+
+from caching_policies import ConcurrentCache, LRUCache, ignore_discard
+from catalogs import Catalogs
+from locale_cache import LocaleCache
+from timezone_registry import TimezoneRegistry
+from user_store import (CachedUserRepository, DictUserRepository,
+                        SQLiteUserRepository)
 
 
 class Config:
@@ -28,11 +38,20 @@ class Config:
         Defaults to "en".
         BABEL_DEFAULT_TIMEZONE (str): The default timezone to use.
         Defaults to "UTC".
+        USERS_DATABASE (str): A SQLite database to look users up in.
+        Defaults to None, for the in-memory `users` table.
+        CATALOGS_RELOAD_INTERVAL (float): How often, in seconds, the
+        translation catalogs are checked for changes. Defaults to 1.
+        PAGE_CACHE_SIZE (int): The number of rendered index pages kept.
+        Defaults to 1024.
     """
 
     LANGUAGES = ["en", "fr"]
     BABEL_DEFAULT_LOCALE = "en"
     BABEL_DEFAULT_TIMEZONE = "UTC"
+    USERS_DATABASE = None
+    CATALOGS_RELOAD_INTERVAL = 1.0
+    PAGE_CACHE_SIZE = 1024
 
 
 app = Flask(__name__)
@@ -40,6 +59,18 @@ app.config.from_object(Config)
 
 babel = Babel(app)
 
+catalogs = Catalogs(os.path.join(app.root_path, "translations"),
+                    app.config["LANGUAGES"])
+catalogs.watch(app.config["CATALOGS_RELOAD_INTERVAL"])
+
+locale_cache = LocaleCache()
+timezones = TimezoneRegistry()
+page_cache = ConcurrentCache(LRUCache, app.config["PAGE_CACHE_SIZE"],
+                             listener=ignore_discard)
+
+# Stands for the current time in cached pages, filled in per request
+TIME_SLOT = "\x00current_time\x00"
+
 users = {
     1: {"name": "Balou", "locale": "fr", "timezone": "Europe/Paris"},
     2: {"name": "Beyonce", "locale": "en", "timezone": "US/Central"},
@@ -47,19 +78,76 @@ users = {
     4: {"name": "Teletubby", "locale": None, "timezone": "Europe/London"},
 }
 
+if app.config["USERS_DATABASE"]:
+    user_store = CachedUserRepository(
+        SQLiteUserRepository(app.config["USERS_DATABASE"]))
+else:
+    user_store = CachedUserRepository(DictUserRepository(users))
+
+
+def request_locale() -> str:
+    """
+    Return the locale of the current request, selected once and kept
+    in flask.g.
+
+    Returns:
+        str: The locale (e.g. "fr").
+    """
+    if "locale" not in g:
+        g.locale = str(current_locale())
+    return g.locale
+
+
+def gettext(msgid: str) -> str:
+    """
+    Translate a message into the locale of the current request.
+
+    Returns:
+        str: The translated message, or msgid if it has none.
+    """
+    return catalogs.gettext(request_locale(), msgid)
+
+
+def ngettext(singular: str, plural: str, n: int) -> str:
+    """
+    Translate the singular or plural form of a message for `n`.
+
+    Returns:
+        str: The translated form.
+    """
+    return catalogs.ngettext(request_locale(), singular, plural, n)
+
+
+def _(msgid: str, **variables) -> str:
+    """
+    Translate a message and substitute `variables` into it, like
+    flask_babel's `_`, from the in-memory `catalogs`.
+
+    Returns:
+        str: The translated message.
+    """
+    text = gettext(msgid)
+    return text % variables if variables else text
+
+
+app.jinja_env.install_gettext_callables(gettext, ngettext, newstyle=True)
+
 
 def get_user():
     """
     Get a user dictionary based on the login_as URL parameter.
 
+    Users are read through the `user_store` cache, which also
+    remembers unknown ids.
+
     Returns:
         dict: The user dictionary if found, otherwise None.
     """
     try:
         user_id = int(request.args.get("login_as"))
-        return users.get(user_id)
     except (TypeError, ValueError):
         return None
+    return user_store.get(user_id)
 
 
 @app.before_request
@@ -79,7 +167,8 @@ def get_locale():
 
     This function is used to select the best language to
     use based on the client's Accept-Language header or
-    the 'locale' URL parameter.
+    the 'locale' URL parameter. Matches of the header are
+    memoized in `locale_cache`.
 
     Returns:
         str: The best matching language code (e.g. "en", "fr").
@@ -93,7 +182,31 @@ def get_locale():
         return locale
     if g.user and g.user.get("locale") in app.config["LANGUAGES"]:
         return g.user["locale"]
-    return request.accept_languages.best_match(app.config["LANGUAGES"])
+    return locale_cache.best_match(
+        request.headers.get("Accept-Language", ""), app.config["LANGUAGES"]
+    )
+
+
+def get_tzinfo() -> tzinfo:
+    """
+    Resolve the timezone of the current request.
+
+    The timezone is resolved once per request, from the 'timezone'
+    URL parameter, the user's settings or the default, through the
+    `timezones` registry, and kept in flask.g.
+
+    Returns:
+        tzinfo: The timezone of the request.
+    """
+    if "tzinfo" not in g:
+        timezone = timezones.resolve(request.args.get("timezone"))
+        if timezone is None and g.user:
+            timezone = timezones.resolve(g.user.get("timezone"))
+        if timezone is None:
+            timezone = timezones.resolve(
+                app.config["BABEL_DEFAULT_TIMEZONE"])
+        g.tzinfo = timezone
+    return g.tzinfo
 
 
 @babel.timezoneselector
@@ -112,34 +225,56 @@ def get_timezone():
         >>> get_timezone()
         "UTC"
     """
-    timezone = request.args.get("timezone")
-    if timezone:
-        try:
-            return pytz.timezone(timezone).zone
-        except UnknownTimeZoneError:
-            pass
-    if g.user:
-        user_timezone = g.user.get("timezone")
-        if user_timezone:
-            try:
-                return pytz.timezone(user_timezone).zone
-            except UnknownTimeZoneError:
-                pass
-    return app.config["BABEL_DEFAULT_TIMEZONE"]
+    return get_tzinfo().zone
+
+
+def render_index() -> Tuple[str, str, str]:
+    """
+    Render the index page around its current time, once per locale,
+    user and catalogs version.
+
+    The page is rendered with TIME_SLOT as the current time and split
+    there; the halves are kept in `page_cache` with a tag of their
+    content.
+
+    Returns:
+        tuple: The page before the current time, the page after it, and
+        their tag.
+    """
+    key = (request_locale(), g.user["name"] if g.user else None,
+           catalogs.generation)
+    page = page_cache.get(key)
+    if page is None:
+        before, after = render_template(
+            "index.html",
+            title=_("home_title"),
+            header=_("home_header"),
+            current_time=TIME_SLOT,
+        ).split(TIME_SLOT)
+        tag = hashlib.sha1((before + TIME_SLOT + after).encode())
+        page = (before, after, tag.hexdigest()[:16])
+        page_cache.put(key, page)
+    return page
 
 
 @app.route("/")
 def index():
-    """Route for the index page."""
-    current_time = datetime.now(pytz.timezone(get_timezone())).strftime(
-        "%b %d, %Y, %I:%M:%S %p"
-    )
-    return render_template(
-        "index.html",
-        title=_("home_title"),
-        header=_("home_header"),
-        current_time=current_time,
-    )
+    """
+    Route for the index page.
+
+    Only the current time is rendered per request, into the cached
+    page. Responses carry an ETag and a Last-Modified date (the
+    current second, as the page shows seconds), and conditional
+    requests for an unchanged page get a 304.
+    """
+    now = datetime.now(get_tzinfo()).replace(microsecond=0)
+    current_time = now.strftime("%b %d, %Y, %I:%M:%S %p")
+    before, after, tag = render_index()
+    response = make_response(before + str(escape(current_time)) + after)
+    response.set_etag("{}-{}".format(tag, now.strftime("%Y%m%d%H%M%S%z")))
+    response.last_modified = now
+    response.vary.add("Accept-Language")
+    return response.make_conditional(request)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""
+Microbenchmark of Accept-Language negotiation.
+
+Resolves a trace of Accept-Language headers drawn from a Zipf-like
+distribution over realistic header strings (a few browsers' defaults are
+most of the traffic), the way get_locale used to, parsing and scoring each
+header, and through LocaleCache. Prints the time per header and the
+cache's hit rate.
+
+Usage:
+    ./bench_locale.py [requests] [distinct_headers]
+"""
+
+import random
+import sys
+import time
+from typing import Callable, List
+
+from werkzeug.datastructures import LanguageAccept
+from werkzeug.http import parse_accept_header
+
+from locale_cache import LocaleCache
+
+LANGUAGES = ["en", "fr"]
+BASES = ["en-US,en;q=0.9", "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
+         "en-GB,en;q=0.9", "fr-CH, fr;q=0.9, en;q=0.8, de;q=0.7, *;q=0.5",
+         "de-DE,de;q=0.9,en;q=0.8", "es-ES,es;q=0.9", "en", "fr",
+         "nl-NL,nl;q=0.9,en-US;q=0.8,en;q=0.7", "*"]
+
+
+def headers(distinct: int) -> List[str]:
+    """Return `distinct` header strings, the most common first."""
+    values = list(BASES)
+    rng = random.Random(1)
+    while len(values) < distinct:
+        tags = rng.sample(["en", "fr", "de", "es", "it", "nl", "pt", "ja"],
+                          rng.randint(1, 4))
+        values.append(",".join("{};q=0.{}".format(tag, 9 - i)
+                               for i, tag in enumerate(tags)))
+    return values[:distinct]
+
+
+def trace(requests: int, distinct: int) -> List[str]:
+    """Return `requests` headers, the k-th most common with weight 1/k."""
+    values = headers(distinct)
+    weights = [1 / k for k in range(1, len(values) + 1)]
+    return random.Random(0).choices(values, weights, k=requests)
+
+
+def parse_each_time(header: str) -> str:
+    """Negotiate the way get_locale used to."""
+    return parse_accept_header(header, LanguageAccept).best_match(LANGUAGES)
+
+
+def timed(select: Callable[[str], str], requests: List[str]) -> float:
+    """Return the seconds taken to resolve every header."""
+    start = time.perf_counter()
+    for header in requests:
+        select(header)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Resolve the trace both ways and print the cost per header."""
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    requests_trace = trace(requests, distinct)
+    cache = LocaleCache()
+
+    def cached(header: str) -> str:
+        """Negotiate through the cache."""
+        return cache.best_match(header, LANGUAGES)
+
+    assert all(cached(h) == parse_each_time(h) for h in set(requests_trace))
+    cache = LocaleCache()
+    print("{:>10} {:>12}".format("selector", "us/header"))
+    for name, select in (("parse", parse_each_time), ("cached", cached)):
+        elapsed = timed(select, requests_trace)
+        print("{:>10} {:>12.2f}".format(name, elapsed / requests * 1e6))
+    print("hit rate: {:.1%}".format(cache.cache.stats()["hit_ratio"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of translation lookups.
+
+Times `_()` in a request for each locale, through Flask-Babel (as the
+app used to translate) and through the in-memory catalogs of app.py.
+Prints the time per call.
+
+Usage:
+    ./bench_translations.py [calls]
+"""
+
+import sys
+import time
+from typing import Callable
+
+import flask_babel
+
+app_module = __import__("app")
+
+MESSAGES = ["home_title", "home_header", "not_logged_in", "missing"]
+
+
+def timed(translate: Callable[[str], str], calls: int) -> float:
+    """Return the seconds taken by `calls` translations."""
+    messages = MESSAGES * (calls // len(MESSAGES))
+    start = time.perf_counter()
+    for msgid in messages:
+        translate(msgid)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Time both paths in a request for each supported locale."""
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print("{:>8} {:>14} {:>14}".format("locale", "babel us", "catalogs us"))
+    for locale in app_module.app.config["LANGUAGES"]:
+        url = "/?locale={}".format(locale)
+        with app_module.app.test_request_context(url):
+            app_module.before_request()
+            for msgid in MESSAGES:
+                assert flask_babel.gettext(msgid) == app_module._(msgid)
+            babel = timed(flask_babel.gettext, calls)
+            catalogs = timed(app_module._, calls)
+        print("{:>8} {:>14.3f} {:>14.3f}".format(
+            locale, babel / calls * 1e6, catalogs / calls * 1e6))
+
+
+if __name__ == "__main__":
+    main()
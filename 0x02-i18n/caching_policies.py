@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+
+"""
+Module giving the i18n apps access to the caching policies of 0x01-caching.
+
+The policies live in a sibling project whose modules have hyphenated
+names, so the directory is added to the import path and the modules are
+loaded with __import__, as in that project.
+"""
+
+import os
+import sys
+
+CACHING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           os.pardir, "0x01-caching")
+if CACHING_DIR not in sys.path:
+    sys.path.append(CACHING_DIR)
+
+ignore_discard = __import__("base_caching").ignore_discard
+ConcurrentCache = __import__("concurrent_cache").ConcurrentCache
+LRUCache = __import__("3-lru_cache").LRUCache
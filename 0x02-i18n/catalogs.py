@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+"""
+Module for in-memory translation catalogs.
+
+Every compiled catalog (translations/<lang>/LC_MESSAGES/messages.mo) of
+the supported languages is loaded once into a flat dict, so translating a
+string is a single lookup. A background thread watches the .mo files and,
+when one changes, loads it off the request path and swaps the catalogs in
+with one assignment: requests in flight keep the catalogs they started
+with and never wait for a reload.
+"""
+
+import gettext
+import os
+import threading
+import traceback
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+Catalog = Tuple[Dict, Callable[[int], int]]
+
+
+def germanic_plural(n: int) -> int:
+    """Return the plural form of `n` for catalogs without Plural-Forms."""
+    return int(n != 1)
+
+
+class Catalogs:
+    """
+    The translation catalogs of a set of languages.
+
+    Attributes:
+        directory (str): The translations directory.
+        languages (tuple): The languages loaded.
+        catalogs (dict): The messages and plural rule of each language,
+        replaced as a whole on reload.
+        versions (dict): The modification time of each catalog loaded,
+        None if it had no .mo file.
+        generation (int): The number of times the catalogs were swapped,
+        for caches of translated output to key on.
+    """
+
+    def __init__(self, directory: str, languages: Sequence[str],
+                 domain: str = "messages") -> None:
+        """Load the catalogs of `languages` from `directory`."""
+        self.directory = directory
+        self.domain = domain
+        self.languages = tuple(languages)
+        self.versions: Dict[str, Optional[int]] = {}
+        self.catalogs: Dict[str, Catalog] = {}
+        self.generation = 0
+        self.reload()
+
+    def path(self, language: str) -> str:
+        """Return the path of the compiled catalog of a language."""
+        return os.path.join(self.directory, language, "LC_MESSAGES",
+                            self.domain + ".mo")
+
+    def version(self, language: str) -> Optional[int]:
+        """Return the modification time of a catalog, None if missing."""
+        try:
+            return os.stat(self.path(language)).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self, language: str) -> Optional[Catalog]:
+        """
+        Read the messages and plural rule of a language's catalog.
+
+        Returns:
+            tuple: The catalog, or None if the file could not be read or
+            parsed (for instance while `pybabel compile` is writing it).
+        """
+        try:
+            with open(self.path(language), "rb") as f:
+                translations = gettext.GNUTranslations(f)
+        except Exception:
+            return None
+        messages = {msgid: text
+                    for msgid, text in translations._catalog.items()
+                    if msgid and text}
+        return messages, translations.plural
+
+    def reload(self) -> bool:
+        """
+        Reload the catalogs whose .mo file changed since they were loaded.
+
+        A catalog that fails to load keeps its previous version, and its
+        new version is not recorded so that it is tried again; until one
+        loads, a language has an empty catalog.
+
+        Returns:
+            bool: Whether any catalog was reloaded.
+        """
+        catalogs = dict(self.catalogs)
+        changed = False
+        for language in self.languages:
+            version = self.version(language)
+            if language in catalogs and version == self.versions[language]:
+                continue
+            catalog = None if version is None else self.load(language)
+            if catalog is None and version is not None:
+                if language in catalogs:
+                    continue
+                version = None
+            catalogs[language] = catalog or ({}, germanic_plural)
+            self.versions[language] = version
+            changed = True
+        if changed:
+            self.catalogs = catalogs
+            self.generation += 1
+        return changed
+
+    def watch(self, interval: float = 1.0) -> threading.Event:
+        """
+        Start a daemon thread reloading changed catalogs every `interval`
+        seconds.
+
+        Returns:
+            threading.Event: Set it to stop the thread.
+        """
+        stop = threading.Event()
+
+        def run() -> None:
+            """Reload until stopped."""
+            while not stop.wait(interval):
+                try:
+                    self.reload()
+                except Exception:
+                    traceback.print_exc()
+
+        threading.Thread(target=run, daemon=True).start()
+        return stop
+
+    def catalog(self, locale: str) -> Catalog:
+        """Return the catalog of a locale, or of its language."""
+        catalog = self.catalogs.get(locale)
+        if catalog is None:
+            catalog = self.catalogs.get(locale.split("_")[0],
+                                        ({}, germanic_plural))
+        return catalog
+
+    def gettext(self, locale: str, msgid: str) -> str:
+        """Translate a message, or return it untranslated."""
+        return self.catalog(locale)[0].get(msgid, msgid)
+
+    def ngettext(self, locale: str, singular: str, plural: str,
+                 n: int) -> str:
+        """Translate the singular or plural of a message for `n`."""
+        messages, rule = self.catalog(locale)
+        text = messages.get((singular, rule(n)))
+        if text is None:
+            text = singular if n == 1 else plural
+        return text
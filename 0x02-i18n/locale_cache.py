@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+"""
+Module for memoized Accept-Language negotiation.
+
+Real traffic sends few distinct Accept-Language headers, so the language
+each header resolves to is kept in a bounded LRU cache (the LRUCache of
+0x01-caching, behind its thread-safe ConcurrentCache front) keyed by the
+raw header and the supported languages. A repeated header then resolves
+without parsing or scoring it again.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+from werkzeug.datastructures import LanguageAccept
+from werkzeug.http import parse_accept_header
+
+from caching_policies import ConcurrentCache, LRUCache, ignore_discard
+
+
+class LocaleCache:
+    """
+    Bounded cache of Accept-Language negotiations.
+
+    Attributes:
+        max_items (int): The number of distinct headers kept.
+        languages (tuple): The supported languages the cached matches
+        were made against; the cache is emptied when they change.
+    """
+
+    def __init__(self, max_items: int = 256) -> None:
+        """Initialize an empty cache of `max_items` headers."""
+        self.max_items = max_items
+        self.languages: Tuple[str, ...] = ()
+        self.cache = self._new_cache()
+
+    def _new_cache(self):
+        """Return an empty LRU cache."""
+        return ConcurrentCache(LRUCache, self.max_items,
+                               listener=ignore_discard)
+
+    def best_match(self, header: str,
+                   languages: Sequence[str]) -> Optional[str]:
+        """
+        Return the supported language best matching an Accept-Language
+        header, like `request.accept_languages.best_match(languages)`.
+
+        Args:
+            header (str): The raw Accept-Language header value.
+            languages (Sequence[str]): The supported languages.
+
+        Returns:
+            str: The best matching language, or None if none matches.
+        """
+        languages = tuple(languages)
+        if languages != self.languages:
+            self.cache = self._new_cache()
+            self.languages = languages
+        key = (header, languages)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit[0]
+        match = parse_accept_header(header, LanguageAccept).best_match(
+            languages)
+        self.cache.put(key, (match,))
+        return match
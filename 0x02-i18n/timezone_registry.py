@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+"""
+Module for resolving timezone names without exceptions.
+
+The names pytz knows are indexed once, case-insensitively as pytz itself
+matches them, so checking a name is a dict lookup instead of a call to
+`pytz.timezone` that raises UnknownTimeZoneError, and an unknown name
+(such as "Vulcan") is rejected by that same lookup. Resolved tzinfo
+objects are kept by canonical name.
+"""
+
+from datetime import tzinfo
+from typing import Dict, Optional
+
+import pytz
+
+ZONES = {name.lower(): name for name in pytz.all_timezones}
+
+
+class TimezoneRegistry:
+    """
+    Registry of the timezones resolved so far.
+
+    Attributes:
+        resolved (dict): The tzinfo of each canonical zone name used.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.resolved: Dict[str, tzinfo] = {}
+
+    def resolve(self, name: Optional[str]) -> Optional[tzinfo]:
+        """
+        Return the timezone of a name, like `pytz.timezone(name)`.
+
+        Args:
+            name (str): A timezone name, in any case.
+
+        Returns:
+            tzinfo: The timezone, or None if the name is empty or unknown.
+        """
+        timezone = self.resolved.get(name)
+        if timezone is not None:
+            return timezone
+        if not isinstance(name, str) or not name:
+            return None
+        zone = ZONES.get(name.lower())
+        if zone is None:
+            return None
+        timezone = self.resolved.get(zone)
+        if timezone is None:
+            timezone = self.resolved[zone] = pytz.timezone(zone)
+        return timezone
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""
+Module for looking users up behind get_user.
+
+A UserRepository maps user ids to user dictionaries ({"name", "locale",
+"timezone"}), fetching any number of them in one call. Two are provided:
+DictUserRepository over an in-memory dict, and SQLiteUserRepository, a
+reference implementation over a SQLite table for local testing.
+
+CachedUserRepository puts an in-process read-through cache in front of
+any repository: users are fetched from it on a miss and kept for `ttl`
+seconds, and ids it does not know (bad `login_as` values) are remembered
+too, for `negative_ttl` seconds, so they are not looked up on every
+request either.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, Mapping, Optional
+
+from caching_policies import ConcurrentCache, LRUCache, ignore_discard
+
+User = Dict[str, Optional[str]]
+
+
+class UserRepository:
+    """
+    Base class of the user stores.
+
+    Subclasses implement get_many; get fetches a single user through it.
+    """
+
+    def get(self, user_id: int) -> Optional[User]:
+        """
+        Get a user by id.
+
+        Returns:
+            dict: The user dictionary if found, otherwise None.
+        """
+        return self.get_many([user_id]).get(user_id)
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """
+        Get users by id, in one batch.
+
+        Returns:
+            dict: The user dictionary of each id found.
+        """
+        raise NotImplementedError(
+            "get_many must be implemented in your repository class")
+
+
+class DictUserRepository(UserRepository):
+    """User store over an in-memory dictionary of users by id."""
+
+    def __init__(self, users: Mapping[int, User]) -> None:
+        """Initialize the store over `users`."""
+        self.users = users
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Get users by id, in one batch."""
+        users = self.users
+        return {user_id: users[user_id] for user_id in user_ids
+                if user_id in users}
+
+
+class SQLiteUserRepository(UserRepository):
+    """
+    User store over a SQLite table.
+
+    The table is `users(id INTEGER PRIMARY KEY, name, locale, timezone)`,
+    created if missing. Each thread uses its own connection.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, path: str) -> None:
+        """Open (or create) the database at `path`."""
+        self.path = path
+        self.local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "id INTEGER PRIMARY KEY, name TEXT, locale TEXT, timezone TEXT)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the database."""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = self.local.connection = sqlite3.connect(self.path)
+        return connection
+
+    def add_many(self, users: Mapping[int, User]) -> None:
+        """Insert or replace users by id."""
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)",
+                [(user_id, user.get("name"), user.get("locale"),
+                  user.get("timezone")) for user_id, user in users.items()])
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """
+        Get users by id, BATCH_SIZE ids per query.
+
+        Ids outside SQLite's integer range are never found.
+        """
+        user_ids = [user_id for user_id in user_ids
+                    if -1 << 63 <= user_id < 1 << 63]
+        users = {}
+        connection = self._connection()
+        for start in range(0, len(user_ids), self.BATCH_SIZE):
+            batch = user_ids[start:start + self.BATCH_SIZE]
+            rows = connection.execute(
+                "SELECT id, name, locale, timezone FROM users "
+                "WHERE id IN ({})".format(", ".join("?" * len(batch))),
+                batch)
+            for user_id, name, locale, timezone in rows:
+                users[user_id] = {"name": name, "locale": locale,
+                                  "timezone": timezone}
+        return users
+
+
+class CachedUserRepository(UserRepository):
+    """
+    Read-through cache in front of another user store.
+
+    Attributes:
+        repository (UserRepository): The store users are fetched from.
+        cache (ConcurrentCache): An LRU cache of (user,) by id, with
+        (None,) for the ids the store does not know.
+    """
+
+    def __init__(self, repository: UserRepository, max_items: int = 100000,
+                 ttl: Optional[float] = 300,
+                 negative_ttl: Optional[float] = 60) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            repository (UserRepository): The store to read through to.
+            max_items (int): The number of ids kept.
+            ttl (float): The seconds a user is kept, None for ever.
+            negative_ttl (float): The seconds an unknown id is kept.
+        """
+        self.repository = repository
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.cache = ConcurrentCache(LRUCache, max_items, segments=16,
+                                     listener=ignore_discard)
+
+    def get(self, user_id: int) -> Optional[User]:
+        """Get a user by id, from the cache if it is there."""
+        hit = self.cache.get(user_id)
+        if hit is not None:
+            return hit[0]
+        user = self.repository.get(user_id)
+        self._store(user_id, user)
+        return user
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Get users by id, fetching those not cached in one batch."""
+        users = {}
+        missing = []
+        for user_id in user_ids:
+            hit = self.cache.get(user_id)
+            if hit is None:
+                missing.append(user_id)
+            elif hit[0] is not None:
+                users[user_id] = hit[0]
+        if missing:
+            users.update(self.prefetch(missing))
+        return users
+
+    def prefetch(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """
+        Fetch users from the store in one batch and cache them, replacing
+        any cached entry (so this also refreshes users who changed).
+
+        Returns:
+            dict: The user dictionary of each id found.
+        """
+        user_ids = list(user_ids)
+        users = self.repository.get_many(user_ids)
+        for user_id in user_ids:
+            self._store(user_id, users.get(user_id))
+        return users
+
+    def _store(self, user_id: int, user: Optional[User]) -> None:
+        """Cache a user, or the absence of one."""
+        if user is None:
+            self.cache.put(user_id, (None,), self.negative_ttl)
+        else:
+            self.cache.put(user_id, (user,), self.ttl)